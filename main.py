@@ -1,15 +1,21 @@
 """
 Shape Studio - Main Entry Point
 """
-from src.core.canvas import Canvas
-from src.commands.executor import CommandExecutor
-from src.ui.interface import ShapeStudioUI
-from src.config import config
+import faulthandler
 
 
 def main():
     """Initialize and run Shape Studio with dual canvas system"""
-    
+    # Heavy modules (PIL, tkinter, the command/procedural stack) are imported
+    # here rather than at module load so importing main stays cheap
+    from src.config import config
+    from src.core.canvas import Canvas
+    from src.commands.executor import CommandExecutor
+    from src.ui.interface import ShapeStudioUI
+
+    # Dump a traceback on hard crashes (e.g. inside Tcl) instead of dying silently
+    faulthandler.enable()
+
     # Initialize configuration (load from file if present, otherwise use defaults)
     config.load()
 
@@ -28,4 +34,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
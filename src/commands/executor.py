@@ -5,36 +5,125 @@ Plus PROC system for procedural generation
 """
 import os
 import json
-import copy
 import random
+import re
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
-from src.core.shape import Line, Polygon, ShapeGroup
+from src.core.shape import Line, Polygon, ShapeGroup, HISTORY_LIMIT, format_timestamp
 from src.commands.parser import CommandParser
 from src.core.procedural import ProceduralGenerators
 from src.core.templates import TemplateLibrary, TemplateExecutor
 from src.config import config
-from src.core.enhancement import EnhancementRegistry
 from src.commands.help_data import HELP as HELP_DATA
 
+try:
+    import orjson  # optional: faster parsing of store/project/script files
+except ImportError:
+    orjson = None
+
+# Parsed script files kept for reuse across RUN/BATCH invocations
+SCRIPT_CACHE_SIZE = 32
+
+# Section markers in plain-text scripts: "@label" lines (group 1 is the
+# label) and "EOF" lines (any case), with surrounding whitespace
+_TEXT_MARKER_RE = re.compile(r'^[^\S\n]*(?:@(.*)|(?i:eof)[^\S\n]*)$', re.MULTILINE)
+
 class CommandExecutor:
     """Execute commands on WIP or Main canvas"""
     
+    # Command name -> handler method name. Shared by execute() and
+    # _execute_from_dict(); resolved with getattr so no per-call dict is built
+    _HANDLERS = {
+        'LINE': '_execute_line',
+        'POLY': '_execute_poly',
+        'MOVE': '_execute_move',
+        'ROTATE': '_execute_rotate',
+        'SCALE': '_execute_scale',
+        'RESIZE': '_execute_resize',
+        'GROUP': '_execute_group',
+        'UNGROUP': '_execute_ungroup',
+        'EXTRACT': '_execute_extract',
+        'DELETE': '_execute_delete',
+        'SWITCH': '_execute_switch',
+        'PROMOTE': '_execute_promote',
+        'UNPROMOTE': '_execute_unpromote',
+        'STASH': '_execute_stash',
+        'UNSTASH': '_execute_unstash',
+        'STORE': '_execute_store',
+        'LOAD': '_execute_load',
+        'SAVE_PROJECT': '_execute_save_project',
+        'LOAD_PROJECT': '_execute_load_project',
+        'CLEAR': '_execute_clear',
+        'LIST': '_execute_list',
+        'INFO': '_execute_info',
+        'SAVE': '_execute_save',
+        'RUN': '_execute_run',
+        'BATCH': '_execute_batch',
+        'PROC': '_execute_proc',
+        'LIST_PRESET': '_execute_list_preset',
+        'INFO_PROC': '_execute_info_proc',
+        'ANIMATE': '_execute_animate',
+        'COLOR': '_execute_color',
+        'WIDTH': '_execute_width',
+        'FILL': '_execute_fill',
+        'ALPHA': '_execute_alpha',
+        'ZORDER': '_execute_zorder',
+        'EXIT': '_execute_exit',
+        'VALIDATE': '_execute_validate',
+        'RESET_ZORDER': '_execute_reset_zorder',
+        'ENHANCE': '_execute_enhance',
+        'RENAME': '_execute_rename',
+        'WORKWITH': '_execute_workwith',
+        'VIEWPORT': '_execute_viewport',
+        'CONFIG': '_execute_config',
+        'DEFORM': '_execute_deform',
+        'COMPOSE': '_execute_compose',
+        'REFLECT': '_execute_reflect',
+        'REPLAY': '_execute_replay',
+        'HIGH': '_execute_high',
+        'HELP': '_execute_help',
+    }
+
     def __init__(self, wip_canvas, main_canvas):
         self.wip_canvas = wip_canvas
         self.main_canvas = main_canvas
         self.active_canvas = wip_canvas  # Start with WIP active
         self.active_canvas_name = 'WIP'
         
+        # Handler table bound to this instance, so dispatch is a single
+        # dict lookup with no per-command getattr
+        self._handlers = {command: getattr(self, handler_name)
+                          for command, handler_name in self._HANDLERS.items()}
+        
         self.parser = CommandParser()
+        # Optional memo of parsed commands for script/replay workloads where
+        # the same lines recur. Off by default (size 0): interactive input is
+        # rarely repeated, so the cache would only add overhead there.
+        parse_cache_size = config.get('executor.parse_cache_size', 0)
+        self._parse_cached = (lru_cache(maxsize=parse_cache_size)(self.parser.parse)
+                              if parse_cache_size else None)
         self.procedural_gen = ProceduralGenerators() 
         self.template_library = TemplateLibrary(project_root='.')
         self.template_executor = TemplateExecutor(self.template_library, self)
-        self.enhancement_registry = EnhancementRegistry()
         
         # Separate shape registries for each canvas
         self.wip_shapes = {}
         self.main_shapes = {}
+        # Registry of the active canvas; reassigned whenever the active canvas changes
+        self.active_shapes = self.wip_shapes
+        # "not found" message for the active canvas, rebuilt on canvas switch
+        self._err_not_found = "Shape '{}' not found on WIP canvas"
+        # Canvas name -> (canvas, shape registry); used wherever a command
+        # picks a canvas by name (SWITCH, CLEAR, LOAD_PROJECT)
+        self._canvases = {
+            'WIP': (self.wip_canvas, self.wip_shapes),
+            'MAIN': (self.main_canvas, self.main_shapes),
+        }
         
         # Global stash for temporary storage
         self.stash = {}
@@ -53,91 +142,116 @@ class CommandExecutor:
         self.global_store_dir = config.paths.global_library
         self.projects_dir = Path(config.paths.projects)
         self.scripts_dir = Path(config.paths.scripts)
+        # String forms for STORE/LOAD path joins (skips PurePath construction)
+        self._project_store_path = os.fspath(self.project_store_dir)
+        self._global_store_path = os.fspath(self.global_store_dir)
+        
+        # Directories are created on first use by a command that writes to
+        # disk (see _ensure_dirs), so sessions that never save pay nothing
+        self._dirs_ready = False
+        # Stored shape file path -> (mtime_ns, shape type), for LIST STORE/GLOBAL
+        self._store_type_cache = {}
+        # Script file path -> (mtime_ns, parsed JSON), least recently used first
+        self._script_cache = OrderedDict()
+        
+        # LIST target -> shape registry to list, or a zero-arg callable that
+        # builds the listing (the registries are never rebound, only mutated)
+        self._list_targets = {
+            'WIP': self.wip_shapes,
+            'MAIN': self.main_shapes,
+            'STASH': self.stash,
+            'STORE': partial(self._list_store, self.project_store_dir, "project store"),
+            'GLOBAL': partial(self._list_store, self.global_store_dir, "global library"),
+            'PROC': self._list_proc_methods,
+            'ENHANCE': self._list_enhance_methods,
+        }
         
-        # Create directories
+    def _ensure_dirs(self):
+        """Create the output/store/project/script directories once"""
+        if self._dirs_ready:
+            return
         os.makedirs(config.paths.output, exist_ok=True)
         os.makedirs(self.project_store_dir, exist_ok=True)
         os.makedirs(self.global_store_dir, exist_ok=True)
         os.makedirs(self.projects_dir, exist_ok=True)
         os.makedirs(self.scripts_dir, exist_ok=True)
+        self._dirs_ready = True
+        
+    @contextmanager
+    def batch(self):
+        """Defer canvas redraws for the duration of a block
+        
+        Used around script and batch loops: each command still updates the
+        shapes, but both canvases are redrawn once when the block exits
+        (or earlier if an image is needed, e.g. by SAVE).
+        """
+        self.wip_canvas.hold_redraw()
+        self.main_canvas.hold_redraw()
+        try:
+            yield
+        finally:
+            self.wip_canvas.release_redraw()
+            self.main_canvas.release_redraw()
         
+    @property
+    def enhancement_registry(self):
+        """Shared enhancement registry, loaded on first ENHANCE/LIST ENHANCE use"""
+        from src.core.enhancement import get_registry
+        return get_registry()
         
     def get_active_shapes(self):
         """Get the shapes dictionary for the active canvas"""
-        if self.active_canvas_name == 'WIP':
-            return self.wip_shapes
-        else:
-            return self.main_shapes
-            
-    def _sync_active_canvas(self):
-        """Sync active canvas's shape list with executor's registry"""
-        if self.active_canvas_name == 'WIP':
-            self.wip_canvas.sync_shapes(self.wip_shapes)
-        else:
-            self.main_canvas.sync_shapes(self.main_shapes)
+        return self.active_shapes
             
     def execute(self, command_text):
         """Execute a command string"""
-        # Parse the command
-        cmd_dict = self.parser.parse(command_text)
-        command = cmd_dict['command']
-
-        # Route to handler
-        handlers = {
-            'LINE': self._execute_line,
-            'POLY': self._execute_poly,
-            'MOVE': self._execute_move,
-            'ROTATE': self._execute_rotate,
-            'SCALE': self._execute_scale,
-            'RESIZE': self._execute_resize,
-            'GROUP': self._execute_group,
-            'UNGROUP': self._execute_ungroup,
-            'EXTRACT': self._execute_extract,
-            'DELETE': self._execute_delete,
-            'SWITCH': self._execute_switch,
-            'PROMOTE': self._execute_promote,
-            'UNPROMOTE': self._execute_unpromote,
-            'STASH': self._execute_stash,
-            'UNSTASH': self._execute_unstash,
-            'STORE': self._execute_store,
-            'LOAD': self._execute_load,
-            'SAVE_PROJECT': self._execute_save_project,
-            'LOAD_PROJECT': self._execute_load_project,
-            'CLEAR': self._execute_clear,
-            'LIST': self._execute_list,
-            'INFO': self._execute_info,
-            'SAVE': self._execute_save,
-            'RUN': self._execute_run,
-            'BATCH': self._execute_batch,
-            'PROC': self._execute_proc,
-            'LIST_PRESET': self._execute_list_preset,
-            'INFO_PROC': self._execute_info_proc,
-            'ANIMATE': self._execute_animate,
-            'COLOR': self._execute_color,
-            'WIDTH': self._execute_width,
-            'FILL': self._execute_fill,
-            'ALPHA': self._execute_alpha,
-            'ZORDER': self._execute_zorder,
-            'EXIT': self._execute_exit,
-            'VALIDATE': self._execute_validate,
-            'RESET_ZORDER': self._execute_reset_zorder,
-            'ENHANCE': self._execute_enhance,
-            'RENAME': self._execute_rename,
-            'WORKWITH': self._execute_workwith,
-            'VIEWPORT': self._execute_viewport,
-            'CONFIG': self._execute_config,
-            'DEFORM': self._execute_deform,
-            'COMPOSE': self._execute_compose,
-            'REFLECT': self._execute_reflect,
-            'REPLAY': self._execute_replay,
-            'HIGH':   self._execute_high,
-            'HELP': self._execute_help,
-        }
+        return self.execute_parsed(self._parse(command_text), command_text)
         
-        if command in handlers:
-            return handlers[command](cmd_dict, command_text)
-        else:
+    def execute_parsed(self, cmd_dict, command_text=''):
+        """
+        Execute a command that has already been parsed.
+        
+        Callers that hold CommandParser output can dispatch it directly
+        and skip parsing.
+        
+        Args:
+            cmd_dict: Parsed command dictionary (from CommandParser.parse)
+            command_text: Original text, recorded in shape history
+            
+        Returns:
+            Result message from the command handler
+        """
+        command = cmd_dict['command']
+        handler = self._handlers.get(command)
+        if handler is None:
             raise ValueError(f"Unknown command: {command}")
+        return handler(cmd_dict, command_text)
+            
+    def _parse(self, command_text):
+        """Parse a command string, using the parse cache when enabled
+        
+        Text containing RAND()/RANDBOOL() is always re-parsed, since the
+        parser substitutes fresh random values each time.
+        """
+        if self._parse_cached is None or 'RAND' in command_text:
+            return self.parser.parse(command_text)
+        # Shallow copy so handlers can't alter the cached entry
+        return dict(self._parse_cached(command_text))
+            
+    def _require_ungrouped(self, shape, name,
+                           hint="Transform the group, EXTRACT it, or UNGROUP first."):
+        """Raise if the shape belongs to a group; members change only via their group"""
+        group = shape.group
+        if group:
+            raise ValueError(f"Shape '{name}' is in group '{group}'. {hint}")
+            
+    def _get_transformable(self, name):
+        """Look up a shape on the active canvas that can be transformed directly"""
+        shape = self.active_shapes.get(name)
+        if shape is None:
+            raise ValueError(self._err_not_found.format(name))
+        self._require_ungrouped(shape, name)
+        return shape
             
     def _execute_line(self, cmd_dict, command_text):
         """Execute LINE command on active canvas"""
@@ -145,7 +259,7 @@ class CommandExecutor:
         start = cmd_dict['start']
         end = cmd_dict['end']
         
-        shapes = self.get_active_shapes()
+        shapes = self.active_shapes
         
         if name in shapes:
             raise ValueError(f"Shape '{name}' already exists on {self.active_canvas_name} canvas")
@@ -162,7 +276,7 @@ class CommandExecutor:
         name = cmd_dict['name']
         points = cmd_dict['points']
         
-        shapes = self.get_active_shapes()
+        shapes = self.active_shapes
         
         if name in shapes:
             raise ValueError(f"Shape '{name}' already exists on {self.active_canvas_name} canvas")
@@ -179,16 +293,7 @@ class CommandExecutor:
         name = self._resolve_shape_name(cmd_dict.get('name'))
         delta = cmd_dict['delta']
         
-        shapes = self.get_active_shapes()
-        
-        if name not in shapes:
-            raise ValueError(f"Shape '{name}' not found on {self.active_canvas_name} canvas")
-        
-        shape = shapes[name]
-        
-        if shape.attrs['relationships']['group']:
-            raise ValueError(f"Shape '{name}' is in group '{shape.attrs['relationships']['group']}'. "
-                           "Transform the group, EXTRACT it, or UNGROUP first.")
+        shape = self._get_transformable(name)
         
         shape.move(delta[0], delta[1])
         shape.add_history('TRANSFORM', command_text)
@@ -201,16 +306,7 @@ class CommandExecutor:
         name = self._resolve_shape_name(cmd_dict.get('name'))
         angle = cmd_dict['angle']
         
-        shapes = self.get_active_shapes()
-        
-        if name not in shapes:
-            raise ValueError(f"Shape '{name}' not found on {self.active_canvas_name} canvas")
-        
-        shape = shapes[name]
-        
-        if shape.attrs['relationships']['group']:
-            raise ValueError(f"Shape '{name}' is in group '{shape.attrs['relationships']['group']}'. "
-                           "Transform the group, EXTRACT it, or UNGROUP first.")
+        shape = self._get_transformable(name)
         
         shape.rotate(angle)
         shape.add_history('TRANSFORM', command_text)
@@ -223,16 +319,7 @@ class CommandExecutor:
         name = self._resolve_shape_name(cmd_dict.get('name'))
         factor = cmd_dict['factor']
         
-        shapes = self.get_active_shapes()
-        
-        if name not in shapes:
-            raise ValueError(f"Shape '{name}' not found on {self.active_canvas_name} canvas")
-        
-        shape = shapes[name]
-        
-        if shape.attrs['relationships']['group']:
-            raise ValueError(f"Shape '{name}' is in group '{shape.attrs['relationships']['group']}'. "
-                           "Transform the group, EXTRACT it, or UNGROUP first.")
+        shape = self._get_transformable(name)
         
         shape.scale(factor)
         shape.add_history('TRANSFORM', command_text)
@@ -246,16 +333,7 @@ class CommandExecutor:
         x_factor = cmd_dict['x_factor']
         y_factor = cmd_dict['y_factor']
         
-        shapes = self.get_active_shapes()
-        
-        if name not in shapes:
-            raise ValueError(f"Shape '{name}' not found on {self.active_canvas_name} canvas")
-        
-        shape = shapes[name]
-        
-        if shape.attrs['relationships']['group']:
-            raise ValueError(f"Shape '{name}' is in group '{shape.attrs['relationships']['group']}'. "
-                           "Transform the group, EXTRACT it, or UNGROUP first.")
+        shape = self._get_transformable(name)
         
         shape.resize(x_factor, y_factor)
         shape.add_history('TRANSFORM', command_text)
@@ -275,11 +353,10 @@ class CommandExecutor:
         along = cmd_dict['along']
         across = cmd_dict['across']
 
-        shapes = self.get_active_shapes()
-        if name not in shapes:
-            raise ValueError(f"Shape '{name}' not found on {self.active_canvas_name} canvas")
-
-        shape = shapes[name]
+        shapes = self.active_shapes
+        shape = shapes.get(name)
+        if shape is None:
+            raise ValueError(self._err_not_found.format(name))
         if shape.attrs['type'] != 'Polygon':
             raise ValueError(f"DEFORM only supports Polygon shapes, '{name}' is {shape.attrs['type']}")
 
@@ -296,7 +373,7 @@ class CommandExecutor:
         group_name = cmd_dict['name']
         member_names = cmd_dict['members']
         
-        shapes = self.get_active_shapes()
+        shapes = self.active_shapes
         
         if group_name in shapes:
             raise ValueError(f"Shape '{group_name}' already exists on {self.active_canvas_name} canvas")
@@ -304,14 +381,13 @@ class CommandExecutor:
         # Collect member shapes
         members = []
         for member_name in member_names:
-            if member_name not in shapes:
-                raise ValueError(f"Shape '{member_name}' not found on {self.active_canvas_name} canvas")
+            shape = shapes.get(member_name)
+            if shape is None:
+                raise ValueError(self._err_not_found.format(member_name))
             
-            shape = shapes[member_name]
-            
-            if shape.attrs['relationships']['group']:
+            if shape.group:
                 raise ValueError(f"Shape '{member_name}' is already in group "
-                               f"'{shape.attrs['relationships']['group']}'")
+                               f"'{shape.group}'")
             
             members.append(shape)
         
@@ -328,27 +404,25 @@ class CommandExecutor:
         """Execute UNGROUP command on active canvas"""
         group_name = cmd_dict['name']
         
-        shapes = self.get_active_shapes()
+        shapes = self.active_shapes
         
-        if group_name not in shapes:
+        shape = shapes.get(group_name)
+        if shape is None:
             raise ValueError(f"Group '{group_name}' not found on {self.active_canvas_name} canvas")
         
-        shape = shapes[group_name]
-        
-        if not isinstance(shape, ShapeGroup):
+        if not shape.is_group:
             raise ValueError(f"'{group_name}' is not a group")
         
         # Get members and clear their group relationship
         members = shape.attrs['geometry']['members']
+        now = time.time()  # one timestamp for the whole ungroup
         for member in members:
-            member.attrs['relationships']['group'] = None
-            member.add_history('UNGROUP', command_text)
+            member.group = None
+            member.add_history('UNGROUP', command_text, now)
         
-        # Remove the group from registry
+        # Remove the group from registry; members stay on the canvas
         del shapes[group_name]
-        
-        # SYNC: Rebuild canvas shape list from registry
-        self._sync_active_canvas()
+        self.active_canvas.remove_shape(shape)
         
         return f"Ungrouped '{group_name}' ({len(members)} members now independent)"
         
@@ -357,44 +431,42 @@ class CommandExecutor:
         member_name = cmd_dict['member']
         group_name = cmd_dict['group']
         
-        shapes = self.get_active_shapes()
+        shapes = self.active_shapes
         
         # Check group exists
-        if group_name not in shapes:
+        group = shapes.get(group_name)
+        if group is None:
             raise ValueError(f"Group '{group_name}' not found on {self.active_canvas_name} canvas")
         
-        group = shapes[group_name]
-        
-        if not isinstance(group, ShapeGroup):
+        if not group.is_group:
             raise ValueError(f"'{group_name}' is not a group")
         
         # Check member exists in group
-        if member_name not in shapes:
-            raise ValueError(f"Shape '{member_name}' not found on {self.active_canvas_name} canvas")
-        
-        member = shapes[member_name]
+        member = shapes.get(member_name)
+        if member is None:
+            raise ValueError(self._err_not_found.format(member_name))
         
-        if member.attrs['relationships']['group'] != group_name:
+        if member.group != group_name:
             raise ValueError(f"Shape '{member_name}' is not in group '{group_name}'")
         
         # Remove member from group
+        group.remove_member(member)
         members = group.attrs['geometry']['members']
-        members.remove(member)
         
         # Clear member's group relationship
-        member.attrs['relationships']['group'] = None
+        member.group = None
         member.add_history('EXTRACT', command_text)
         
         # If group is now empty or has only 1 member, delete it
         if len(members) == 0:
             del shapes[group_name]
-            self._sync_active_canvas()
+            self.active_canvas.remove_shape(group)
             return f"Extracted '{member_name}' from '{group_name}' (group now empty, deleted)"
         elif len(members) == 1:
             last_member = members[0]
-            last_member.attrs['relationships']['group'] = None
+            last_member.group = None
             del shapes[group_name]
-            self._sync_active_canvas()
+            self.active_canvas.remove_shape(group)
             return f"Extracted '{member_name}' from '{group_name}' (group dissolved, '{last_member.name}' now independent)"
         
         self.active_canvas.redraw()
@@ -405,20 +477,18 @@ class CommandExecutor:
         shape_name = cmd_dict['name']
         confirm = cmd_dict['confirm']
         
-        shapes = self.get_active_shapes()
+        shapes = self.active_shapes
         
-        if shape_name not in shapes:
-            raise ValueError(f"Shape '{shape_name}' not found on {self.active_canvas_name} canvas")
-        
-        shape = shapes[shape_name]
+        shape = shapes.get(shape_name)
+        if shape is None:
+            raise ValueError(self._err_not_found.format(shape_name))
         
         # Check if shape is in a group
-        if shape.attrs['relationships']['group']:
-            raise ValueError(f"Shape '{shape_name}' is in group '{shape.attrs['relationships']['group']}'. "
-                           "EXTRACT it first or UNGROUP the group.")
+        self._require_ungrouped(shape, shape_name,
+                                "EXTRACT it first or UNGROUP the group.")
         
         # Safety check: If it's a group with members, require CONFIRM
-        if isinstance(shape, ShapeGroup):
+        if shape.is_group:
             members = shape.attrs['geometry']['members']
             if len(members) > 0 and not confirm:
                 raise ValueError(f"'{shape_name}' is a group with {len(members)} members. "
@@ -426,7 +496,7 @@ class CommandExecutor:
             
             # Free all members
             for member in members:
-                member.attrs['relationships']['group'] = None
+                member.group = None
         
         # Remove from registry
         del shapes[shape_name]
@@ -435,8 +505,8 @@ class CommandExecutor:
         if self.workwith == shape_name:
             self.workwith = None
 
-        # SYNC FIX: Rebuild canvas shape list from registry
-        self._sync_active_canvas()
+        # Drop just this shape from the canvas (a deleted group's members stay)
+        self.active_canvas.remove_shape(shape)
         
         return f"Deleted '{shape_name}' from {self.active_canvas_name}"
     
@@ -445,15 +515,13 @@ class CommandExecutor:
         old_name = cmd_dict['old_name']
         new_name = cmd_dict['new_name']
         
-        shapes = self.get_active_shapes()
+        shapes = self.active_shapes
         
         # Resolve old_name — handles canonical aliases from collision resolution
         try:
             storage_name, shape = self._get_shape(old_name, shapes)
         except ValueError:
-            raise ValueError(
-                f"Shape '{old_name}' not found on {self.active_canvas_name} canvas"
-            )
+            raise ValueError(self._err_not_found.format(old_name))
         
         # New name must be free
         if new_name in shapes:
@@ -473,7 +541,7 @@ class CommandExecutor:
         # shape's origin name, not its current user-assigned label
         
         shape.add_history('RENAME', command_text)
-        self._sync_active_canvas()
+        # The canvas holds shape objects, not names - nothing to resync
         
         if storage_name != old_name:
             # User used a canonical alias to find it
@@ -507,13 +575,11 @@ class CommandExecutor:
             return "WORKWITH cleared"
 
         # Verify shape exists on the active canvas
-        shapes = self.get_active_shapes()
+        shapes = self.active_shapes
         try:
             storage_name, _ = self._get_shape(name, shapes)
         except ValueError:
-            raise ValueError(
-                f"Shape '{name}' not found on {self.active_canvas_name} canvas"
-            )
+            raise ValueError(self._err_not_found.format(name))
 
         self.workwith = storage_name
         display = f"'{storage_name}'" if storage_name == name else f"'{storage_name}' (via '{name}')"
@@ -576,16 +642,14 @@ class CommandExecutor:
         
     def _execute_switch(self, cmd_dict, command_text):
         """Execute SWITCH command - change active canvas"""
-        target = cmd_dict['target']
-        
-        if target == 'WIP':
-            self.active_canvas = self.wip_canvas
-            self.active_canvas_name = 'WIP'
-        else:  # MAIN
-            self.active_canvas = self.main_canvas
-            self.active_canvas_name = 'MAIN'
-        
+        self._set_active(cmd_dict['target'])
         return f"Switched to {self.active_canvas_name} canvas"
+    
+    def _set_active(self, name):
+        """Make the named canvas ('WIP' or 'MAIN') the active one"""
+        self.active_canvas, self.active_shapes = self._canvases[name]
+        self.active_canvas_name = name
+        self._err_not_found = f"Shape '{{}}' not found on {name} canvas"
         
     def _execute_promote(self, cmd_dict, command_text):
         """Execute PROMOTE command - move/copy shape from WIP to Main"""
@@ -593,13 +657,12 @@ class CommandExecutor:
         mode = cmd_dict['mode']
         
         # Check shape exists on WIP
-        if shape_name not in self.wip_shapes:
+        shape = self.wip_shapes.get(shape_name)
+        if shape is None:
             raise ValueError(f"Shape '{shape_name}' not found on WIP canvas")
         
-        shape = self.wip_shapes[shape_name]
-        
-        # Deep copy the shape
-        promoted_shape = copy.deepcopy(shape)
+        # Copy the shape
+        promoted_shape = shape.clone()
         promoted_shape.add_history('PROMOTE', command_text)
         
         # Resolve name collision; set canonical_name on the copy
@@ -618,8 +681,7 @@ class CommandExecutor:
             del self.wip_shapes[shape_name]
             if self.workwith == shape_name:
                 self.workwith = None
-            # SYNC FIX: Rebuild WIP canvas shape list from registry
-            self.wip_canvas.sync_shapes(self.wip_shapes)
+            self.wip_canvas.remove_shape(shape)
             return f"Promoted '{shape_name}' from WIP to MAIN (moved)"
         else:  # copy mode
             return f"Promoted '{shape_name}' from WIP to MAIN (copied)"
@@ -630,13 +692,12 @@ class CommandExecutor:
         mode = cmd_dict['mode']
         
         # Check shape exists on Main
-        if shape_name not in self.main_shapes:
+        shape = self.main_shapes.get(shape_name)
+        if shape is None:
             raise ValueError(f"Shape '{shape_name}' not found on MAIN canvas")
         
-        shape = self.main_shapes[shape_name]
-        
-        # Deep copy the shape
-        unpromoted_shape = copy.deepcopy(shape)
+        # Copy the shape
+        unpromoted_shape = shape.clone()
         unpromoted_shape.add_history('UNPROMOTE', command_text)
         
         # Resolve name collision; set canonical_name on the copy
@@ -653,8 +714,7 @@ class CommandExecutor:
         # If move mode, remove from Main
         if mode == 'move':
             del self.main_shapes[shape_name]
-            # SYNC FIX: Rebuild Main canvas shape list from registry
-            self.main_canvas.sync_shapes(self.main_shapes)
+            self.main_canvas.remove_shape(shape)
             return f"Unpromoted '{shape_name}' from MAIN to WIP (moved)"
         else:  # copy mode
             return f"Unpromoted '{shape_name}' from MAIN to WIP (copied)"
@@ -663,31 +723,27 @@ class CommandExecutor:
         """Execute STASH command - move shape to temporary storage"""
         shape_name = cmd_dict['name']
         
-        shapes = self.get_active_shapes()
+        shapes = self.active_shapes
         
-        if shape_name not in shapes:
-            raise ValueError(f"Shape '{shape_name}' not found on {self.active_canvas_name} canvas")
+        shape = shapes.get(shape_name)
+        if shape is None:
+            raise ValueError(self._err_not_found.format(shape_name))
         
         if shape_name in self.stash:
             raise ValueError(f"Shape '{shape_name}' already in stash")
         
-        shape = shapes[shape_name]
-        
         # Check if shape is in a group
-        if shape.attrs['relationships']['group']:
-            raise ValueError(f"Shape '{shape_name}' is in group '{shape.attrs['relationships']['group']}'. "
-                           "EXTRACT it first or UNGROUP the group.")
+        self._require_ungrouped(shape, shape_name,
+                                "EXTRACT it first or UNGROUP the group.")
         
-        # Deep copy and add to stash
-        stashed_shape = copy.deepcopy(shape)
+        # Copy and add to stash
+        stashed_shape = shape.clone()
         stashed_shape.add_history('STASH', command_text)
         self.stash[shape_name] = stashed_shape
         
         # Remove from active canvas
         del shapes[shape_name]
-        
-        # SYNC FIX: Rebuild canvas shape list from registry
-        self._sync_active_canvas()
+        self.active_canvas.remove_shape(shape)
         
         return f"Stashed '{shape_name}' from {self.active_canvas_name}"
         
@@ -696,13 +752,14 @@ class CommandExecutor:
         shape_name = cmd_dict['name']
         mode = cmd_dict['mode']
         
-        if shape_name not in self.stash:
+        stashed = self.stash.get(shape_name)
+        if stashed is None:
             raise ValueError(f"Shape '{shape_name}' not found in stash")
         
-        shapes = self.get_active_shapes()
+        shapes = self.active_shapes
         
-        # Deep copy from stash
-        unstashed_shape = copy.deepcopy(self.stash[shape_name])
+        # Copy from stash
+        unstashed_shape = stashed.clone()
         unstashed_shape.add_history('UNSTASH', command_text)
         
         # Resolve name collision; set canonical_name
@@ -741,95 +798,109 @@ class CommandExecutor:
             raise ValueError(f"Clearing {target} canvas requires ALL keyword for safety. "
                            f"Use: CLEAR {target} ALL")
         
-        if target == 'WIP':
-            self.wip_canvas.clear()
-            self.wip_shapes.clear()
-            return "WIP canvas cleared"
-        else:  # MAIN
-            self.main_canvas.clear()
-            self.main_shapes.clear()
-            return "MAIN canvas cleared"
+        canvas, shapes = self._canvases[target]
+        canvas.clear()
+        shapes.clear()
+        return f"{target} canvas cleared"
+        
+    def _find_shape(self, shape_name):
+        """Find a shape by name in WIP, then MAIN, then the stash
+        
+        The same name may exist in several places (e.g. after PROMOTE COPY),
+        so this searches in priority order rather than keeping a single
+        name -> location index.
+        
+        Returns:
+            (location, shape) - ('WIP'|'MAIN'|'STASH', Shape), or (None, None)
+        """
+        for location, registry in (('WIP', self.wip_shapes),
+                                   ('MAIN', self.main_shapes),
+                                   ('STASH', self.stash)):
+            shape = registry.get(shape_name)
+            if shape is not None:
+                return location, shape
+        return None, None
         
     def _execute_info(self, cmd_dict, command_text):
         """Execute INFO command - show detailed shape information"""
         shape_name = cmd_dict['name']
         
         # Search for shape in WIP, MAIN, and stash
-        shape = None
-        location = None
-        
-        if shape_name in self.wip_shapes:
-            shape = self.wip_shapes[shape_name]
-            location = 'WIP'
-        elif shape_name in self.main_shapes:
-            shape = self.main_shapes[shape_name]
-            location = 'MAIN'
-        elif shape_name in self.stash:
-            shape = self.stash[shape_name]
-            location = 'STASH'
-        else:
+        location, shape = self._find_shape(shape_name)
+        if shape is None:
             raise ValueError(f"Shape '{shape_name}' not found on any canvas or stash")
         
-        # Build info string
-        info = [f"Shape: {shape_name}"]
-        info.append(f"Location: {location}")
-        info.append(f"Type: {shape.attrs['type']}")
-        
-        # Geometry info
-        geom = shape.attrs['geometry']
-        if shape.attrs['type'] == 'Line':
-            info.append(f"Start: {geom['start']}")
-            info.append(f"End: {geom['end']}")
-        elif shape.attrs['type'] == 'Polygon':
-            info.append(f"Vertices: {len(geom['points'])}")
-            info.append(f"Points: {geom['points']}")
-        elif shape.attrs['type'] == 'ShapeGroup':
-            members = geom['members']
-            info.append(f"Members ({len(members)}): {[m.name for m in members]}")
-        
-        # Style info
-        style = shape.attrs['style']
-        info.append(f"Color: {style['color']}")
-        info.append(f"Width: {style['width']}")
-        info.append(f"Z-Order: {style['z_coord']}")
-
-        # Relationships
-        rel = shape.attrs['relationships']
-        if rel['group']:
-            info.append(f"In group: {rel['group']}")
-        
-        # Procedural info
-        proc = shape.attrs.get('procedure')
-        if proc:
-            info.append("")
-            info.append("Procedural Generation:")
-            info.append(f"  Method: {proc.get('method', 'unknown')}")
-            
-            # Statistics
-            stats = proc.get('statistics', {})
-            if stats:
-                info.append(f"  Successful: {stats.get('successful_modifications', 0)}")
-                info.append(f"  Failed: {stats.get('failed_attempts', 0)}")
-            
-            # Debug log
-            debug_log = proc.get('debug_log')
-            if debug_log:
-                info.append("")
-                info.append(self._format_debug_log(debug_log))
-
-        # History (last 5 commands)
-        history = shape.attrs['history']
-        if history:
-            info.append(f"History (last 5):")
-            for action_type, command, timestamp in history[-5:]:
-                info.append(f"  [{action_type}] {command}")
-        
-        return "\n".join(info)
+        attrs = shape.attrs
+        max_points = config.get('executor.info_max_points', 64)
+        
+        def lines():
+            yield f"Shape: {shape_name}"
+            yield f"Location: {location}"
+            yield f"Type: {attrs['type']}"
+            
+            # Geometry info
+            geom = attrs['geometry']
+            if attrs['type'] == 'Line':
+                yield f"Start: {geom['start']}"
+                yield f"End: {geom['end']}"
+            elif attrs['type'] == 'Polygon':
+                points = geom['points']
+                yield f"Vertices: {len(points)}"
+                # Stringifying thousands of vertices is slow and unreadable
+                if len(points) > max_points:
+                    yield (f"Points: {points[:max_points]} "
+                           f"... (+{len(points) - max_points} more)")
+                else:
+                    yield f"Points: {points}"
+            elif attrs['type'] == 'ShapeGroup':
+                members = geom['members']
+                yield f"Members ({len(members)}): {[m.name for m in members]}"
+            
+            # Style info
+            style = attrs['style']
+            yield f"Color: {style['color']}"
+            yield f"Width: {style['width']}"
+            yield f"Z-Order: {style['z_coord']}"
+            
+            # Relationships
+            group = shape.group
+            if group:
+                yield f"In group: {group}"
+            
+            # Procedural info
+            proc = attrs.get('procedure')
+            if proc:
+                yield ""
+                yield "Procedural Generation:"
+                yield f"  Method: {proc.get('method', 'unknown')}"
+                
+                # Statistics
+                stats = proc.get('statistics', {})
+                if stats:
+                    yield f"  Successful: {stats.get('successful_modifications', 0)}"
+                    yield f"  Failed: {stats.get('failed_attempts', 0)}"
+                
+                # Debug log
+                debug_log = proc.get('debug_log')
+                if debug_log:
+                    yield ""
+                    yield self._format_debug_log(debug_log)
+            
+            # History (last 5 commands)
+            history = attrs['history']
+            if history:
+                yield "History (last 5):"
+                recent = islice(history, max(len(history) - 5, 0), None)
+                for action_type, command, timestamp in recent:
+                    yield f"  [{action_type}] {command}"
+        
+        return "\n".join(lines())
         
     def _execute_save(self, cmd_dict, command_text):
         """Execute SAVE command - always saves MAIN canvas"""
         filename = cmd_dict['filename']
         filepath = os.path.join(config.paths.output, filename)
+        self._ensure_dirs()
         
         # Always save the MAIN canvas
         self.main_canvas.save(filepath)
@@ -842,56 +913,110 @@ class CommandExecutor:
         scope = cmd_dict['scope']
         
         # Find shape in WIP, MAIN, or stash
-        shape = None
-        if shape_name in self.wip_shapes:
-            shape = self.wip_shapes[shape_name]
-        elif shape_name in self.main_shapes:
-            shape = self.main_shapes[shape_name]
-        elif shape_name in self.stash:
-            shape = self.stash[shape_name]
-        else:
+        _, shape = self._find_shape(shape_name)
+        if shape is None:
             raise ValueError(f"Shape '{shape_name}' not found")
         
         # Serialize shape
         shape_data = self._serialize_shape(shape)
+        self._ensure_dirs()
         
         # Determine save directory
         if scope == 'global':
-            save_dir = self.global_store_dir
+            save_dir = self._global_store_path
         else:
-            save_dir = self.project_store_dir
+            save_dir = self._project_store_path
         
         # Save to file
         if self._batch_index is not None:
             shape_name = f"{shape_name}_{self._batch_index}"
-        filepath = save_dir / f"{shape_name}.json"
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(shape_data, f, indent=2)
+        filepath = self._store_path(save_dir, shape_name)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        self._write_json(filepath, shape_data)
         
         scope_name = "global library" if scope == 'global' else "project store"
         return f"Stored '{shape_name}' to {scope_name}: {filepath}"
     
+    def _store_path(self, store_dir, shape_name):
+        """Path of a shape's JSON file in a store directory (a plain string)"""
+        return os.path.join(store_dir, shape_name + '.json')
+    
+    def _read_json(self, filepath):
+        """Read store/project/script JSON - via orjson when it is installed
+        
+        Text orjson rejects but the stdlib accepts (the NaN/Infinity tokens
+        _write_json emits for non-finite floats) is re-parsed with json, so
+        what loads never depends on orjson being present. Invalid JSON
+        raises json.JSONDecodeError either way.
+        """
+        # One bulk binary read; both parsers take bytes, so there is no
+        # text-mode decode pass
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        if orjson is not None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(raw)
+    
+    def _read_script_json(self, filepath):
+        """Parsed JSON script, reused while the file's mtime is unchanged
+        
+        BATCH runs the same script once per iteration. Callers treat the
+        returned data as read-only.
+        """
+        key = os.fspath(filepath)
+        mtime = os.stat(key).st_mtime_ns
+        
+        cached = self._script_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            self._script_cache.move_to_end(key)
+            return cached[1]
+        
+        data = self._read_json(key)
+        self._script_cache[key] = (mtime, data)
+        self._script_cache.move_to_end(key)
+        if len(self._script_cache) > SCRIPT_CACHE_SIZE:
+            self._script_cache.popitem(last=False)
+        return data
+    
+    def _write_json(self, filepath, data):
+        """Write store/project JSON - compact unless storage.pretty_json is set
+        
+        Always the stdlib encoder, even with orjson installed: orjson rejects
+        non-string dict keys and writes NaN/inf as null, so saved files would
+        differ depending on which package happens to be present.
+        """
+        pretty = config.get('storage.pretty_json', False)
+        # Encode in one go and hand the file a single write, rather than
+        # json.dump's stream of small chunk writes
+        if pretty:
+            text = json.dumps(data, indent=2)
+        else:
+            text = json.dumps(data, separators=(',', ':'))
+        with open(filepath, 'w') as f:
+            f.write(text)
+    
     def _execute_load(self, cmd_dict, command_text):
         """Execute LOAD command - load shape from object store"""
         shape_name = cmd_dict['name']
         
-        shapes = self.get_active_shapes()
+        shapes = self.active_shapes
         
         # Search project store first, then global
-        filepath = self.project_store_dir / f"{shape_name}.json"
+        filepath = self._store_path(self._project_store_path, shape_name)
         source = "project store"
         
-        if not filepath.exists():
-            filepath = self.global_store_dir / f"{shape_name}.json"
+        if not os.path.exists(filepath):
+            filepath = self._store_path(self._global_store_path, shape_name)
             source = "global library"
         
-        if not filepath.exists():
+        if not os.path.exists(filepath):
             raise ValueError(f"Shape '{shape_name}' not found in project store or global library")
         
         # Load and deserialize — detect composition JSON by key
-        with open(filepath, 'r') as f:
-            shape_data = json.load(f)
+        shape_data = self._read_json(filepath)
 
         if 'composition_id' in shape_data:
             return self._load_composition(shape_data, command_text)
@@ -935,8 +1060,8 @@ class CommandExecutor:
         }
         
         # Save to file
-        with open(filepath, 'w') as f:
-            json.dump(project_data, f, indent=2)
+        self._ensure_dirs()
+        self._write_json(filepath, project_data)
         
         return f"Saved project to {filepath}"
     
@@ -949,8 +1074,7 @@ class CommandExecutor:
             raise ValueError(f"Project file not found: {filepath}")
         
         # Load project data
-        with open(filepath, 'r') as f:
-            project_data = json.load(f)
+        project_data = self._read_json(filepath)
         
         # Clear current state
         self.wip_shapes.clear()
@@ -959,42 +1083,36 @@ class CommandExecutor:
         self.wip_canvas.clear()
         self.main_canvas.clear()
         
-        # Restore WIP shapes
+        # Restore canvas settings (before the shapes, whose bulk add redraws)
+        settings = project_data.get('canvas_settings', {})
+        self.wip_canvas.show_grid = settings.get('show_grid', True)
+        self.wip_canvas.show_rulers = settings.get('show_rulers', True)
+        self.main_canvas.show_grid = settings.get('show_grid', True)
+        self.main_canvas.show_rulers = settings.get('show_rulers', True)
+        
+        # Restore WIP and MAIN shapes - one bulk add (and redraw) per canvas.
+        # As with GROUP, group objects stay in the registry only; their
+        # members are on the canvas already
         for name, shape_data in project_data['wip_shapes'].items():
-            shape = self._deserialize_shape(shape_data)
-            self.wip_shapes[name] = shape
-            self.wip_canvas.add_shape(shape)
+            self.wip_shapes[name] = self._deserialize_shape(shape_data)
+        self._link_group_members(self.wip_shapes)
+        self.wip_canvas.add_shapes([shape for shape in self.wip_shapes.values()
+                                    if not shape.is_group])
         
-        # Restore MAIN shapes
         for name, shape_data in project_data['main_shapes'].items():
-            shape = self._deserialize_shape(shape_data)
-            self.main_shapes[name] = shape
-            self.main_canvas.add_shape(shape)
+            self.main_shapes[name] = self._deserialize_shape(shape_data)
+        self._link_group_members(self.main_shapes)
+        self.main_canvas.add_shapes([shape for shape in self.main_shapes.values()
+                                    if not shape.is_group])
         
         # Restore stash
         for name, shape_data in project_data['stash'].items():
             shape = self._deserialize_shape(shape_data)
             self.stash[name] = shape
         
-        # Restore canvas settings
-        settings = project_data.get('canvas_settings', {})
-        self.wip_canvas.show_grid = settings.get('show_grid', True)
-        self.wip_canvas.show_rulers = settings.get('show_rulers', True)
-        self.main_canvas.show_grid = settings.get('show_grid', True)
-        self.main_canvas.show_rulers = settings.get('show_rulers', True)
-        
         # Restore active canvas
         active = project_data.get('active_canvas', 'WIP')
-        if active == 'MAIN':
-            self.active_canvas = self.main_canvas
-            self.active_canvas_name = 'MAIN'
-        else:
-            self.active_canvas = self.wip_canvas
-            self.active_canvas_name = 'WIP'
-        
-        # Redraw both canvases
-        self.wip_canvas.redraw()
-        self.main_canvas.redraw()
+        self._set_active('MAIN' if active == 'MAIN' else 'WIP')
         
         wip_count = len(self.wip_shapes)
         main_count = len(self.main_shapes)
@@ -1061,11 +1179,8 @@ class CommandExecutor:
         """
         filepath = self.scripts_dir / scriptfile
         
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-        
         # Parse file into sections
-        sections = self._parse_text_sections(lines)
+        sections = self._parse_text_sections(filepath.read_text())
         
         if label:
             # Execute specific labeled section
@@ -1095,12 +1210,13 @@ class CommandExecutor:
         
         # Execute commands
         results = []
-        for i, cmd in enumerate(commands, 1):
-            try:
-                result = self.execute(cmd)
-                results.append(f"  [{i}] {cmd[:60]}{'...' if len(cmd) > 60 else ''} -> {result}")
-            except Exception as e:
-                results.append(f"  [{i}] {cmd[:60]}{'...' if len(cmd) > 60 else ''} -> ERROR: {str(e)}")
+        with self.batch():
+            for i, cmd in enumerate(commands, 1):
+                try:
+                    result = self.execute(cmd)
+                    results.append(f"  [{i}] {cmd[:60]}{'...' if len(cmd) > 60 else ''} -> {result}")
+                except Exception as e:
+                    results.append(f"  [{i}] {cmd[:60]}{'...' if len(cmd) > 60 else ''} -> ERROR: {str(e)}")
         
         header = f"Executed {len(commands)} commands from '{scriptfile}' ({section_desc}):"
         return header + "\n" + "\n".join(results)
@@ -1130,9 +1246,10 @@ class CommandExecutor:
                     f"Usage: RUN {scriptfile} <executable_name>\n"
                     f"Available: {available}"
                 )
-            results = self.template_executor.execute_script(
-                filepath, executable_name, batch_mode=False
-            )
+            with self.batch():
+                results = self.template_executor.execute_script(
+                    filepath, executable_name, batch_mode=False
+                )
             header = f"RUN {scriptfile} [{executable_name}]"
             return header + "\n" + "\n".join(results)
         
@@ -1145,23 +1262,24 @@ class CommandExecutor:
         if 'description' in section_data:
             results.append(f"Description: {section_data['description']}")
         results.append("")
-        for i, cmd in enumerate(commands, 1):
-            try:
-                if isinstance(cmd, str):
-                    result = self.execute(cmd)
-                    results.append(f"  [{i}] {cmd} -> {result}")
-                elif isinstance(cmd, dict):
-                    cmd_display = self._format_structured_command(cmd)
-                    result = self._execute_structured_command(cmd)
-                    results.append(f"  [{i}] {cmd_display} -> {result}")
-                else:
-                    results.append(f"  [{i}] ERROR: Command must be string or dict, got {type(cmd).__name__}")
-            except Exception as e:
-                if isinstance(cmd, str):
-                    results.append(f"  [{i}] {cmd} -> ERROR: {str(e)}")
-                else:
-                    cmd_display = self._format_structured_command(cmd)
-                    results.append(f"  [{i}] {cmd_display} -> ERROR: {str(e)}")
+        with self.batch():
+            for i, cmd in enumerate(commands, 1):
+                try:
+                    if isinstance(cmd, str):
+                        result = self.execute(cmd)
+                        results.append(f"  [{i}] {cmd} -> {result}")
+                    elif isinstance(cmd, dict):
+                        cmd_display = self._format_structured_command(cmd)
+                        result = self._execute_structured_command(cmd)
+                        results.append(f"  [{i}] {cmd_display} -> {result}")
+                    else:
+                        results.append(f"  [{i}] ERROR: Command must be string or dict, got {type(cmd).__name__}")
+                except Exception as e:
+                    if isinstance(cmd, str):
+                        results.append(f"  [{i}] {cmd} -> ERROR: {str(e)}")
+                    else:
+                        cmd_display = self._format_structured_command(cmd)
+                        results.append(f"  [{i}] {cmd_display} -> ERROR: {str(e)}")
         return "\n".join(results)
 
     def _execute_batch(self, cmd_dict, command_text):
@@ -1176,6 +1294,7 @@ class CommandExecutor:
         
         if not filepath.exists():
             raise ValueError(f"Script file not found: {filepath}")
+        self._ensure_dirs()
         
         # Check if this is templated script
         with open(filepath, 'r') as f:
@@ -1190,15 +1309,17 @@ class CommandExecutor:
                 )
             
             store_shapes = cmd_dict.get('store_shapes', False)
-            return self._execute_batch_templated(
-                count, filepath, executable_name, output_prefix, target_canvas,
-                store_shapes=store_shapes
-            )
+            with self.batch():
+                return self._execute_batch_templated(
+                    count, filepath, executable_name, output_prefix, target_canvas,
+                    store_shapes=store_shapes
+                )
         else:
             # Old format - existing behavior
-            return self._execute_batch_legacy(
-                count, filepath, output_prefix, target_canvas
-            )
+            with self.batch():
+                return self._execute_batch_legacy(
+                    count, filepath, output_prefix, target_canvas
+                )
 
     def _execute_batch_templated(self, count, filepath, executable_name, 
                                 output_prefix, target_canvas, store_shapes=False):
@@ -1210,9 +1331,7 @@ class CommandExecutor:
         - All executables: BATCH 100 script.json --ALL prefix
         """
         # Load script to get executables
-        import json
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        data = self._read_script_json(filepath)
         
         executables = data.get('executables', {})
         if not executables:
@@ -1304,8 +1423,7 @@ class CommandExecutor:
                             shape_data['name'] = str(store_name)
                             filepath_out = self.project_store_dir / f"{store_name}.json"
                             filepath_out.parent.mkdir(parents=True, exist_ok=True)
-                            with open(filepath_out, 'w') as f:
-                                json.dump(shape_data, f, indent=2)
+                            self._write_json(filepath_out, shape_data)
                     
                     # Clear for next iteration
                     if target_canvas == 'WIP':
@@ -1313,7 +1431,7 @@ class CommandExecutor:
                     else:
                         self.main_shapes.clear()
                     save_canvas.clear()
-                    self._sync_active_canvas()
+                    save_canvas.redraw()
 
                     # Clear transient DERIVE state
                     self._derive_seed_points = None
@@ -1498,8 +1616,7 @@ class CommandExecutor:
     def _load_json_file(self, filepath):
         """Load and parse JSON file with basic validation"""
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            data = self._read_script_json(filepath)
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in {filepath.name}: {str(e)}")
         
@@ -1660,13 +1777,27 @@ class CommandExecutor:
             'attrs': {}
         }
         
-        # Deep copy attrs to avoid modifying original
-        attrs = copy.deepcopy(shape.attrs)
+        # The result is encoded straight to JSON and never mutated, so a
+        # shallow copy of the top level is enough - no deepcopy of the tree
+        attrs = dict(shape.attrs)
+        
+        # History is a deque of (action, command, time.time()) - write it as
+        # a list with ISO timestamps, as are the metadata times
+        attrs['history'] = [(action, command, format_timestamp(ts))
+                            for action, command, ts in attrs['history']]
+        metadata = attrs.get('metadata')
+        if metadata:
+            metadata = dict(metadata)
+            for key in ('created', 'modified'):
+                if key in metadata:
+                    metadata[key] = format_timestamp(metadata[key])
+            attrs['metadata'] = metadata
         
         # Handle geometry - convert ShapeGroup members to names only
-        if isinstance(shape, ShapeGroup):
-            members = attrs['geometry']['members']
-            attrs['geometry']['members'] = [m.name for m in members]
+        if shape.is_group:
+            geometry = dict(attrs['geometry'])
+            geometry['members'] = [m.name for m in geometry['members']]
+            attrs['geometry'] = geometry
         
         data['attrs'] = attrs
         # Persist canonical_name if set (runtime attribute, not in attrs)
@@ -1677,6 +1808,25 @@ class CommandExecutor:
             data['derived_from'] = shape.derived_from
         return data
     
+    def _link_group_members(self, shapes):
+        """Replace deserialized groups' member names with the shapes they name
+        
+        Args:
+            shapes: Registry the groups and their members were loaded into
+        """
+        for shape in shapes.values():
+            if not shape.is_group:
+                continue
+            geom = shape.attrs['geometry']
+            members = []
+            for member_name in geom['members']:
+                member = shapes.get(member_name)
+                if member is None:
+                    raise ValueError(f"Group '{shape.name}' member '{member_name}' "
+                                     f"missing from project")
+                members.append(member)
+            geom['members'] = members
+    
     def _deserialize_shape(self, data):
         """Recreate shape from JSON data"""
         shape_type = data['type']
@@ -1684,19 +1834,26 @@ class CommandExecutor:
         attrs = data['attrs']
         geom = attrs['geometry']
         
+        # JSON brings coordinates back as lists. Convert them to the tuples
+        # the transforms produce, in the loaded geometry itself, since
+        # attrs replaces the new shape's attrs below.
         if shape_type == 'Line':
-            shape = Line(name, tuple(geom['start']), tuple(geom['end']))
+            geom['start'] = tuple(geom['start'])
+            geom['end'] = tuple(geom['end'])
+            shape = Line(name, geom['start'], geom['end'])
         elif shape_type == 'Polygon':
-            points = [tuple(p) for p in geom['points']]
-            shape = Polygon(name, points)
+            geom['points'] = list(map(tuple, geom['points']))
+            shape = Polygon(name, geom['points'])
         elif shape_type == 'ShapeGroup':
-            # For groups, we'll handle member reconstruction later
-            # For now, create empty group (members will be linked in second pass)
+            # Empty for now; LOAD_PROJECT links the members by name in a
+            # second pass (_link_group_members)
             shape = ShapeGroup(name, [])
         else:
             raise ValueError(f"Unknown shape type: {shape_type}")
         
-        # Restore attrs
+        # Restore attrs (history back into a bounded buffer of tuples; JSON
+        # gives lists, and the saved ISO timestamps are kept as they are)
+        attrs['history'] = deque(map(tuple, attrs['history']), maxlen=HISTORY_LIMIT)
         shape.attrs = attrs
         
         # Restore canonical_name if present (set by collision resolver)
@@ -1728,64 +1885,80 @@ class CommandExecutor:
             
             return self.template_executor.list_executables(filepath)
         
-        if target == 'WIP':
-            shapes = self.wip_shapes
-        elif target == 'MAIN':
-            shapes = self.main_shapes
-        elif target == 'STASH':
-            shapes = self.stash
-        elif target == 'STORE':
-            return self._list_store(self.project_store_dir, "project store")
-        elif target == 'GLOBAL':
-            return self._list_store(self.global_store_dir, "global library")
-        elif target == 'PROC':
-            # List available procedural methods
-            methods = self.procedural_gen.list_methods()
-            return "Available procedural methods:\n  " + "\n  ".join(methods)
-        elif target == 'ENHANCE':
-            return self._list_enhance_methods()
-        else:
+        shapes = self._list_targets.get(target)
+        if shapes is None:
             raise ValueError(f"Unknown LIST target: {target}")
+        if callable(shapes):
+            return shapes()
         
         if not shapes:
             return f"No shapes in {target}"
         
-        shapes_info = []
-        for name, shape in shapes.items():
-            shape_type = shape.attrs['type']
-            
-            if isinstance(shape, ShapeGroup):
-                member_count = len(shape.attrs['geometry']['members'])
-                shapes_info.append(f"{name} (Group: {member_count} members)")
-            else:
-                group = shape.attrs['relationships']['group']
-                if group:
-                    shapes_info.append(f"{name} ({shape_type}, in group '{group}')")
+        # One line per shape, streamed straight into the join below
+        def shapes_info():
+            for name, shape in shapes.items():
+                if shape.is_group:
+                    member_count = len(shape.attrs['geometry']['members'])
+                    yield f"{name} (Group: {member_count} members)"
                 else:
-                    shapes_info.append(f"{name} ({shape_type})")
+                    shape_type = shape.attrs['type']
+                    group = shape.group
+                    if group:
+                        yield f"{name} ({shape_type}, in group '{group}')"
+                    else:
+                        yield f"{name} ({shape_type})"
         
-        if target in ['WIP', 'MAIN']:
-            return f"{target} canvas shapes:\n  " + "\n  ".join(shapes_info)
+        if target in ('WIP', 'MAIN'):
+            return f"{target} canvas shapes:\n  " + "\n  ".join(shapes_info())
         else:
-            return f"Stash:\n  " + "\n  ".join(shapes_info)
+            return f"Stash:\n  " + "\n  ".join(shapes_info())
+    
+    def _list_proc_methods(self):
+        """List available procedural methods"""
+        methods = self.procedural_gen.list_methods()
+        return "Available procedural methods:\n  " + "\n  ".join(methods)
     
     def _list_store(self, store_dir, store_name):
         """List shapes in a store directory"""
-        json_files = list(store_dir.glob('*.json'))
+        # scandir entries rather than Path.glob: no Path object per file,
+        # and the entry carries its own stat for the type cache
+        try:
+            with os.scandir(store_dir) as it:
+                entries = [e for e in it if e.name.endswith('.json') and e.is_file()]
+        except FileNotFoundError:
+            entries = []  # store directory not created yet
         
-        if not json_files:
+        if not entries:
             return f"No shapes in {store_name}"
         
-        shapes_info = []
-        for filepath in sorted(json_files):
-            shape_name = filepath.stem
-            # Load to get type
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            shape_type = data['type']
-            shapes_info.append(f"{shape_name} ({shape_type})")
+        entries.sort(key=lambda e: e.name)
+        shapes_info = (f"{entry.name[:-5]} ({self._stored_shape_type(entry)})"
+                       for entry in entries)
+        
+        return f"{store_name.title()} ({len(entries)} shapes):\n  " + "\n  ".join(shapes_info)
+    
+    def _stored_shape_type(self, entry):
+        """
+        Get the type of a stored shape file, re-reading the file only if
+        its modification time changed since the last LIST.
+        
+        Args:
+            entry: os.DirEntry for the shape's JSON file
+            
+        Returns:
+            Shape type string (e.g. 'Polygon')
+        """
+        key = entry.path
+        mtime = entry.stat().st_mtime_ns
+        
+        cached = self._store_type_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        shape_type = self._read_json(key)['type']
         
-        return f"{store_name.title()} ({len(json_files)} shapes):\n  " + "\n  ".join(shapes_info)
+        self._store_type_cache[key] = (mtime, shape_type)
+        return shape_type
     
     def _execute_proc(self, cmd_dict, command_text):
         """Execute PROC command - call procedural generation method"""
@@ -1802,7 +1975,7 @@ class CommandExecutor:
         # Call procedural generator
         result = self.procedural_gen.call(method_name, shape_name, params)
         
-        shapes = self.get_active_shapes()
+        shapes = self.active_shapes
         
         # Handle different return types
         if isinstance(result, list):
@@ -2069,11 +2242,10 @@ class CommandExecutor:
         name = self._resolve_shape_name(cmd_dict.get('name'))
         color = cmd_dict['color']
         
-        shapes = self.get_active_shapes()
-        if name not in shapes:
-            raise ValueError(f"Shape '{name}' not found on {self.active_canvas_name} canvas")
-        
-        shape = shapes[name]
+        shapes = self.active_shapes
+        shape = shapes.get(name)
+        if shape is None:
+            raise ValueError(self._err_not_found.format(name))
         shape.attrs['style']['color'] = color
         shape.add_history('STYLE', command_text)
         self.active_canvas.redraw()
@@ -2085,11 +2257,10 @@ class CommandExecutor:
         name = self._resolve_shape_name(cmd_dict.get('name'))
         width = cmd_dict['width']
         
-        shapes = self.get_active_shapes()
-        if name not in shapes:
-            raise ValueError(f"Shape '{name}' not found on {self.active_canvas_name} canvas")
-        
-        shape = shapes[name]
+        shapes = self.active_shapes
+        shape = shapes.get(name)
+        if shape is None:
+            raise ValueError(self._err_not_found.format(name))
         shape.attrs['style']['width'] = width
         shape.add_history('STYLE', command_text)
         self.active_canvas.redraw()
@@ -2101,11 +2272,10 @@ class CommandExecutor:
         name = self._resolve_shape_name(cmd_dict.get('name'))
         fill = cmd_dict['fill']
         
-        shapes = self.get_active_shapes()
-        if name not in shapes:
-            raise ValueError(f"Shape '{name}' not found on {self.active_canvas_name} canvas")
-        
-        shape = shapes[name]
+        shapes = self.active_shapes
+        shape = shapes.get(name)
+        if shape is None:
+            raise ValueError(self._err_not_found.format(name))
         shape.attrs['style']['fill'] = fill
         shape.add_history('STYLE', command_text)
         self.active_canvas.redraw()
@@ -2119,11 +2289,10 @@ class CommandExecutor:
         name = self._resolve_shape_name(cmd_dict.get('name'))
         alpha = cmd_dict['alpha']
         
-        shapes = self.get_active_shapes()
-        if name not in shapes:
-            raise ValueError(f"Shape '{name}' not found on {self.active_canvas_name} canvas")
-        
-        shape = shapes[name]
+        shapes = self.active_shapes
+        shape = shapes.get(name)
+        if shape is None:
+            raise ValueError(self._err_not_found.format(name))
         shape.attrs['style']['transparency'] = alpha
         shape.add_history('STYLE', command_text)
         self.active_canvas.redraw()
@@ -2135,11 +2304,10 @@ class CommandExecutor:
         name = self._resolve_shape_name(cmd_dict.get('name'))
         z_coord = cmd_dict['z_coord']
         
-        shapes = self.get_active_shapes()
-        if name not in shapes:
-            raise ValueError(f"Shape '{name}' not found on {self.active_canvas_name} canvas")
-        
-        shape = shapes[name]
+        shapes = self.active_shapes
+        shape = shapes.get(name)
+        if shape is None:
+            raise ValueError(self._err_not_found.format(name))
         shape.attrs['style']['z_coord'] = z_coord
         shape.add_history('STYLE', command_text)
         self.active_canvas.redraw()
@@ -2194,61 +2362,12 @@ class CommandExecutor:
         # Create a dummy command_text for history tracking
         command_text = self._format_structured_command(cmd_dict)
         
-        # Route to existing handlers (same as execute method)
-        handlers = {
-            'LINE': self._execute_line,
-            'POLY': self._execute_poly,
-            'MOVE': self._execute_move,
-            'ROTATE': self._execute_rotate,
-            'SCALE': self._execute_scale,
-            'RESIZE': self._execute_resize,
-            'GROUP': self._execute_group,
-            'UNGROUP': self._execute_ungroup,
-            'EXTRACT': self._execute_extract,
-            'DELETE': self._execute_delete,
-            'SWITCH': self._execute_switch,
-            'PROMOTE': self._execute_promote,
-            'UNPROMOTE': self._execute_unpromote,
-            'STASH': self._execute_stash,
-            'UNSTASH': self._execute_unstash,
-            'STORE': self._execute_store,
-            'LOAD': self._execute_load,
-            'SAVE_PROJECT': self._execute_save_project,
-            'LOAD_PROJECT': self._execute_load_project,
-            'CLEAR': self._execute_clear,
-            'LIST': self._execute_list,
-            'INFO': self._execute_info,
-            'SAVE': self._execute_save,
-            'RUN': self._execute_run,
-            'BATCH': self._execute_batch,
-            'PROC': self._execute_proc,
-            'LIST_PRESET': self._execute_list_preset,
-            'INFO_PROC': self._execute_info_proc,
-            'ANIMATE': self._execute_animate,
-            'COLOR': self._execute_color,
-            'WIDTH': self._execute_width,
-            'FILL': self._execute_fill,
-            'ALPHA': self._execute_alpha,
-            'ZORDER': self._execute_zorder,
-            'EXIT': self._execute_exit,
-            'VALIDATE': self._execute_validate,
-            'RESET_ZORDER': self._execute_reset_zorder,
-            'ENHANCE': self._execute_enhance,
-            'RENAME': self._execute_rename,
-            'WORKWITH': self._execute_workwith,
-            'VIEWPORT': self._execute_viewport,
-            'CONFIG': self._execute_config,
-            'DEFORM': self._execute_deform,
-            'COMPOSE': self._execute_compose,
-            'REFLECT': self._execute_reflect,
-            'HIGH':   self._execute_high,
-            'HELP': self._execute_help,
-        }
-        
-        if command in handlers:
-            return handlers[command](cmd_dict, command_text)
-        else:
+        # Route to existing handlers (same as execute method); REPLAY is
+        # interactive only and not available from structured commands
+        handler = self._handlers.get(command)
+        if handler is None or command == 'REPLAY':
             raise ValueError(f"Unknown command: {command}")
+        return handler(cmd_dict, command_text)
 
     def _process_rand_in_dict(self, cmd_dict):
         """Recursively process RAND() functions in all string values
@@ -2477,8 +2596,11 @@ class CommandExecutor:
         
         return f"Reset z-order counter from {old_value} to {value} on {self.active_canvas_name} canvas"
 
-    def _parse_text_sections(self, lines):
-        """Parse text file lines into labeled sections
+    def _parse_text_sections(self, text):
+        """Parse text file contents into labeled sections
+        
+        Marker lines are located with one regex scan over the whole text;
+        only the command lines between markers are split and stripped.
         
         Returns:
             dict mapping label -> list of commands
@@ -2491,41 +2613,26 @@ class CommandExecutor:
             }
         """
         sections = {}
-        current_label = ''  # Unlabeled section (before any @label)
-        current_commands = []
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines and comments
-            if not line or line.startswith('#'):
-                continue
-            
-            # Check for label marker
-            if line.startswith('@'):
-                # Save previous section if it has commands
-                if current_commands:
-                    sections[current_label] = current_commands
-                
-                # Start new section
-                current_label = line[1:].strip()  # Remove @ and whitespace
-                current_commands = []
-                continue
-            
-            # Check for EOF marker (ends current section)
-            if line.upper() == 'EOF':
-                if current_commands:
-                    sections[current_label] = current_commands
-                current_label = ''  # Reset to unlabeled
-                current_commands = []
-                continue
-            
-            # Regular command line
-            current_commands.append(line)
-        
-        # Save final section if it has commands
-        if current_commands:
-            sections[current_label] = current_commands
+        strip = str.strip
+        
+        # Section bodies sit between consecutive markers; the text before the
+        # first marker (and after each EOF) is the unlabeled section
+        labels = ['']
+        bounds = [0]
+        for marker in _TEXT_MARKER_RE.finditer(text):
+            bounds.append(marker.start())
+            bounds.append(marker.end())
+            label = marker.group(1)
+            labels.append(strip(label) if label is not None else '')
+        bounds.append(len(text))
+        
+        for i, label in enumerate(labels):
+            body = text[bounds[2 * i]:bounds[2 * i + 1]]
+            # Skip empty lines and comments; sections without commands are dropped
+            commands = [line for line in map(strip, body.split('\n'))
+                        if line and line[0] != '#']
+            if commands:
+                sections[label] = commands
         
         return sections
     
@@ -2535,7 +2642,7 @@ class CommandExecutor:
         shape_name = cmd_dict['shape']
         intent_dict = cmd_dict['intent']
         
-        canvas = self.wip_canvas if self.active_canvas_name == 'WIP' else self.main_canvas
+        canvas = self.active_canvas
 
         # Validate
         if method not in self.enhancement_registry.list_methods():
@@ -2734,6 +2841,13 @@ class CommandExecutor:
         """Execute COMPOSE command — load specified shapes under working names,
         save PNG, save construction JSON. Shapes remain on canvas for
         subsequent commands in the same executable."""
+        # on_load and command_loop can run many transforms (the placement
+        # solver especially); redraw once when composing is done
+        with self.batch():
+            return self._compose(cmd_dict, command_text)
+    
+    def _compose(self, cmd_dict, command_text):
+        """COMPOSE body, run with canvas redraws held"""
         from src.composition.compose import CompositionBuilder
 
         compose_params = cmd_dict.get('compose_parameters', {})
@@ -2840,7 +2954,7 @@ class CommandExecutor:
             self.execute(f"LOAD {source}")
 
             # Rename to original working name
-            shapes = self.get_active_shapes()
+            shapes = self.active_shapes
             storage_name = None
             for sname, shape in shapes.items():
                 canonical = getattr(shape, 'canonical_name', shape.name)
@@ -2878,11 +2992,10 @@ class CommandExecutor:
         name = self._resolve_shape_name(cmd_dict.get('name'))
         axis = cmd_dict.get('axis', 'horizontal')
 
-        shapes = self.get_active_shapes()
-        if name not in shapes:
-            raise ValueError(f"Shape '{name}' not found on {self.active_canvas_name} canvas")
-
-        shape = shapes[name]
+        shapes = self.active_shapes
+        shape = shapes.get(name)
+        if shape is None:
+            raise ValueError(self._err_not_found.format(name))
         if shape.attrs['type'] != 'Polygon':
             raise ValueError(
                 f"REFLECT only supports Polygon shapes, '{name}' is {shape.attrs['type']}"
@@ -2941,8 +3054,7 @@ class CommandExecutor:
         if not json_path.exists():
             raise ValueError(f"REPLAY: composition JSON not found: {json_path}")
 
-        with open(json_path, 'r') as f:
-            composition_data = json.load(f)
+        composition_data = self._read_json(json_path)
 
         if 'composition_id' not in composition_data:
             raise ValueError(
@@ -2962,7 +3074,7 @@ class CommandExecutor:
             source       = entry['source']
             working_name = entry['working_name']
             self.execute(f"LOAD {source}")
-            shapes = self.get_active_shapes()
+            shapes = self.active_shapes
             storage_name = None
             for sname, shape in shapes.items():
                 canonical = getattr(shape, 'canonical_name', shape.name)
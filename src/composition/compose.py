@@ -222,7 +222,7 @@ class CompositionBuilder:
             executor.execute(f"LOAD {source_name}")
 
             # Find the loaded shape by canonical name (handles collision suffix)
-            shapes = executor.get_active_shapes()
+            shapes = executor.active_shapes
             storage_name = None
             for sname, shape in shapes.items():
                 canonical = getattr(shape, 'canonical_name', shape.name)
@@ -241,10 +241,10 @@ class CompositionBuilder:
             # Clean up detritus from original shape's history —
             # history and procedure params are irrelevant in composition context.
             # Preserve derived_from breadcrumb if present.
-            shapes = executor.get_active_shapes()
+            shapes = executor.active_shapes
             if working_name in shapes:
                 shape = shapes[working_name]
-                shape.attrs['history'] = []
+                shape.attrs['history'].clear()
                 shape.attrs.pop('procedure', None)
 
             records.append({
@@ -612,12 +612,12 @@ class PlacementSolver:
     def _build_shape_registry(self):
         """Read current geometry of all shapes on the active canvas."""
         registry = {}
-        shapes = self.executor.get_active_shapes()
+        shapes = self.executor.active_shapes
         for name, shape in shapes.items():
             geom = shape.attrs.get('geometry', {})
             pts  = geom.get('points')
             if pts:
-                registry[name] = [tuple(p) for p in pts]
+                registry[name] = list(map(tuple, pts))
         return registry
 
     # -----------------------------------------------------------------------
@@ -52,7 +52,7 @@ def convex_hull(points):
         Ordered list of (x, y) tuples forming the convex hull,
         counter-clockwise. Returns input points if fewer than 3.
     """
-    pts = [tuple(p) for p in points]
+    pts = list(map(tuple, points))
     pts = list(set(pts))  # deduplicate
 
     if len(pts) < 3:
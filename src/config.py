@@ -2,11 +2,42 @@
 Configuration Management for Shape Studio
 Provides centralized configuration with hierarchical access
 """
+import copy
 import json
 import os
 from pathlib import Path
 
 
+# Parsed config files: absolute path -> (mtime_ns, data).
+# Lets repeated Config().load() calls skip re-parsing an unchanged file.
+_file_cache = {}
+
+
+def _read_config_file(config_path):
+    """
+    Read and parse a JSON config file, reusing the last parse if the
+    file's modification time has not changed.
+    
+    Args:
+        config_path: Path to config.json
+        
+    Returns:
+        Parsed dictionary (shared between callers - treat as read-only)
+    """
+    key = os.path.abspath(config_path)
+    mtime = os.stat(key).st_mtime_ns
+    
+    cached = _file_cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    with open(key, 'r') as f:
+        data = json.load(f)
+    
+    _file_cache[key] = (mtime, data)
+    return data
+
+
 class ConfigNode:
     """
     Hierarchical configuration node supporting dot notation access.
@@ -163,8 +194,9 @@ class Config:
         
         # Load from file if present
         if config_path and os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                user_config = json.load(f)
+            # Deep copy: the merge puts override values (lists included) into
+            # this Config's tree as-is, and the parse is cached and shared
+            user_config = copy.deepcopy(_read_config_file(config_path))
             
             # Merge user config with defaults
             merged = self._merge_configs(self._get_defaults(), user_config)
@@ -288,6 +320,17 @@ class Config:
                 'default_loop': False,
             },
             
+            # Shape store and project files
+            'storage': {
+                'pretty_json': False,  # indent saved JSON (bigger, slower; for hand-editing)
+            },
+            
+            # Command execution
+            'executor': {
+                'parse_cache_size': 0,  # LRU size for parsed commands; 0 = off
+                'info_max_points': 64,  # INFO lists at most this many polygon vertices
+            },
+            
             # UI settings (for future use)
             'ui': {
                 'command_log_width': 400,
@@ -24,37 +24,61 @@ class Canvas:
         # Viewport border: (width_px, height_px) or None
         self.viewport = None
         
+        # Blank background (grid + viewport border) reused by redraw()
+        self._background = None
+        self._background_key = None
+        
+        # Redraw deferral: while held, redraw() only marks the image stale
+        self._redraw_holds = 0
+        self._redraw_pending = False
+        
         # Draw initial grid
         if self.show_grid:
             self._draw_grid_on_canvas(self.draw)
 
     def add_shape(self, shape):
         """Add shape to canvas with automatic z-order assignment"""
-        from src.config import config
+        if config.canvas.auto_assign_zorder:
+            self._assign_zorder(shape)
         
-        auto_assign = config.canvas.auto_assign_zorder
+        self.shapes.append(shape)
+        self.redraw()
         
-        if auto_assign:
-            current_z = shape.attrs['style']['z_coord']
-            
-            # Check if the last history entry is a ZORDER command
-            history = shape.attrs.get('history', [])
-            last_command = history[-1][1] if history else ""
-            is_manual_zorder = last_command.startswith('ZORDER')
-            
-            if current_z == 0 and not is_manual_zorder:
-                # Default z=0 and not from ZORDER command -> auto-assign
-                shape.attrs['style']['z_coord'] = self.next_z_coord
-                self.next_z_coord += 1
-            # Else: explicit z_coord (manual ZORDER), counter unchanged
+    def add_shapes(self, shapes):
+        """Add several shapes (same z-order rules as add_shape) with one redraw"""
+        if config.canvas.auto_assign_zorder:
+            for shape in shapes:
+                self._assign_zorder(shape)
         
-        self.shapes.append(shape)
+        self.shapes.extend(shapes)
         self.redraw()
+        
+    def _assign_zorder(self, shape):
+        """Give a shape the next z_coord unless it already has an explicit one"""
+        current_z = shape.attrs['style']['z_coord']
+        
+        # Check if the last history entry is a ZORDER command
+        history = shape.attrs.get('history', [])
+        last_command = history[-1][1] if history else ""
+        is_manual_zorder = last_command.startswith('ZORDER')
+        
+        if current_z == 0 and not is_manual_zorder:
+            # Default z=0 and not from ZORDER command -> auto-assign
+            shape.attrs['style']['z_coord'] = self.next_z_coord
+            self.next_z_coord += 1
+        # Else: explicit z_coord (manual ZORDER), counter unchanged
 
     def remove_shape(self, shape):
-        """Remove a shape from the canvas"""
+        """Remove a single shape from the canvas and redraw
+        
+        Cheaper than sync_shapes() when only one entry changed. Shapes not
+        on the canvas are ignored - e.g. a group made by GROUP or restored
+        by LOAD_PROJECT, which is only registered with the executor. (A
+        group added by PROMOTE/UNSTASH is on the canvas list and is removed.)
+        """
         if shape in self.shapes:
             self.shapes.remove(shape)
+        self.redraw()
             
     def sync_shapes(self, shapes_dict):
         """Sync canvas's shape list with a dictionary of shapes
@@ -70,6 +94,7 @@ class Canvas:
     def clear(self):
         """Clear all shapes and reset canvas"""
         self.shapes = []
+        self._redraw_pending = False
         self.image = Image.new('RGB', (self.width, self.height), 'white')
         self.draw = ImageDraw.Draw(self.image)
         
@@ -81,18 +106,34 @@ class Canvas:
         """Return list of all shapes"""
         return self.shapes
     
+    def hold_redraw(self):
+        """Defer redraws until the matching release_redraw() (nestable)"""
+        self._redraw_holds += 1
+        
+    def release_redraw(self):
+        """End a hold; redraw once if anything changed while held"""
+        self._redraw_holds -= 1
+        if self._redraw_holds == 0:
+            self._flush_redraw()
+            
+    def _flush_redraw(self):
+        """Bring the image up to date if a redraw was deferred"""
+        if self._redraw_pending:
+            self._redraw_pending = False
+            self._render_shapes()
+    
     def redraw(self):
         """Redraw all shapes on a fresh canvas, respecting z-order"""
-        self.image = Image.new('RGBA', (self.width, self.height), (255, 255, 255, 255))
-        self.draw = ImageDraw.Draw(self.image)
+        if self._redraw_holds:
+            self._redraw_pending = True
+            return
+        self._render_shapes()
         
-        # Draw grid first (if enabled) so shapes appear on top
-        if self.show_grid:
-            self._draw_grid_on_canvas(self.draw)
-
-        # Draw viewport border if set (sits above grid, below shapes)
-        if self.viewport is not None:
-            self._draw_viewport_border(self.draw)
+    def _render_shapes(self):
+        """Rebuild self.image from the background and the shape list"""
+        # Start from a copy of the cached background (grid + viewport border)
+        self.image = self._get_background().copy()
+        self.draw = ImageDraw.Draw(self.image)
 
         # Sort shapes by z_coord (lower z_coord drawn first = further back)
         sorted_shapes = sorted(self.shapes, key=lambda s: s.attrs['style']['z_coord'])
@@ -100,6 +141,29 @@ class Canvas:
         for shape in sorted_shapes:
             shape.draw(self.draw)
             
+    def _get_background(self):
+        """Return the blank canvas image with grid and viewport border.
+        
+        Rebuilt only when show_grid or viewport change, so redraw() costs
+        one image copy instead of an allocation plus grid/border drawing.
+        """
+        key = (self.show_grid, self.viewport)
+        if self._background is None or self._background_key != key:
+            image = Image.new('RGBA', (self.width, self.height), (255, 255, 255, 255))
+            draw = ImageDraw.Draw(image)
+            
+            # Draw grid first (if enabled) so shapes appear on top
+            if self.show_grid:
+                self._draw_grid_on_canvas(draw)
+            
+            # Draw viewport border if set (sits above grid, below shapes)
+            if self.viewport is not None:
+                self._draw_viewport_border(draw)
+            
+            self._background = image
+            self._background_key = key
+        return self._background
+            
     def _draw_grid_on_canvas(self, draw):
         """Draw grid lines on the main canvas (every 128px)"""
         grid_color = (220, 220, 220)  # Light gray
@@ -150,6 +214,7 @@ class Canvas:
             
     def save(self, filename):
         """Save the canvas without rulers to PNG file"""
+        self._flush_redraw()
         # Convert RGBA to RGB for saving
         if self.image.mode == 'RGBA':
             rgb_image = Image.new('RGB', self.image.size, (255, 255, 255))
@@ -171,6 +236,7 @@ class Canvas:
         
     def get_display_image(self):
         """Get a copy of the image with optional rulers for display"""
+        self._flush_redraw()
         if self.show_rulers:
             # Create larger image with margin for rulers
             margin = 30
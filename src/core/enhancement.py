@@ -256,10 +256,14 @@ class EnhancementRegistry:
         }
 
 
-# Global registry instance
-_registry = EnhancementRegistry()
+# Global registry instance - built on first request, since discovery
+# imports every enhancer module
+_registry = None
 
 
 def get_registry():
     """Get the global enhancement registry"""
+    global _registry
+    if _registry is None:
+        _registry = EnhancementRegistry()
     return _registry
\ No newline at end of file
@@ -10,6 +10,45 @@ from src.config import config
 from src.core.shape_studies import get_shape_study_registry
 
 
+def _ccw(A, B, C):
+    """Check if three points are in counter-clockwise order"""
+    return (C[1] - A[1]) * (B[0] - A[0]) > (B[1] - A[1]) * (C[0] - A[0])
+
+
+def _point_to_segment_distance(px, py, x1, y1, x2, y2):
+    """Distance from point (px, py) to segment (x1, y1)-(x2, y2).
+    
+    Module level (rather than nested in the caller) because polygon
+    validation calls it millions of times per PROC run.
+    """
+    # Vector from segment start to point
+    dx = px - x1
+    dy = py - y1
+    
+    # Vector along segment
+    sx = x2 - x1
+    sy = y2 - y1
+    
+    # Segment length squared
+    seg_len_sq = sx * sx + sy * sy
+    
+    if seg_len_sq == 0:
+        # Degenerate segment (point)
+        return math.sqrt(dx * dx + dy * dy)
+    
+    # Project point onto line (parameter t)
+    t = max(0, min(1, (dx * sx + dy * sy) / seg_len_sq))
+    
+    # Closest point on segment
+    closest_x = x1 + t * sx
+    closest_y = y1 + t * sy
+    
+    # Distance to closest point
+    dist_x = px - closest_x
+    dist_y = py - closest_y
+    return math.sqrt(dist_x * dist_x + dist_y * dist_y)
+
+
 class ProceduralGenerators:
     """Registry and dispatcher for procedural generation methods"""
     
@@ -216,7 +255,7 @@ class ProceduralGenerators:
         # Get preset if specified (will be used as defaults)
         preset_values = {}
         if 'PRESET' in raw_params:
-            preset_name = raw_params.pop('PRESET').lower()
+            preset_name = raw_params['PRESET'].lower()
             preset_values = self._get_preset(method_name, preset_name)
             # preset_values are already Python types, not strings
         
@@ -1377,13 +1416,9 @@ class ProceduralGenerators:
         Returns:
             True if segments intersect (excluding endpoint touches)
         """
-        def ccw(A, B, C):
-            """Check if three points are in counter-clockwise order"""
-            return (C[1] - A[1]) * (B[0] - A[0]) > (B[1] - A[1]) * (C[0] - A[0])
-        
         # Segments intersect if endpoints are on opposite sides
-        return (ccw(p1, p3, p4) != ccw(p2, p3, p4) and 
-                ccw(p1, p2, p3) != ccw(p1, p2, p4))
+        return (_ccw(p1, p3, p4) != _ccw(p2, p3, p4) and 
+                _ccw(p1, p2, p3) != _ccw(p1, p2, p4))
     
     def _get_perpendicular_direction(self, p1, p2, bias, centroid):
         """Get perpendicular direction vector for a segment.
@@ -1489,18 +1524,30 @@ class ProceduralGenerators:
         if n < 3:
             return True
         
-        # Check each segment against all non-adjacent segments
+        # Edge endpoints plus bounding box, built once per polygon
+        edges = []
         for i in range(n):
             p1 = points[i]
             p2 = points[(i + 1) % n]
+            edges.append((p1, p2,
+                          min(p1[0], p2[0]), max(p1[0], p2[0]),
+                          min(p1[1], p2[1]), max(p1[1], p2[1])))
+        
+        # Check each segment against all non-adjacent segments
+        for i in range(n):
+            p1, p2, ax0, ax1, ay0, ay1 = edges[i]
             
             for j in range(i + 2, n):
                 # Skip if checking last edge against first (adjacent)
                 if i == 0 and j == n - 1:
                     continue
                 
-                p3 = points[j]
-                p4 = points[(j + 1) % n]
+                p3, p4, bx0, bx1, by0, by1 = edges[j]
+                
+                # Boxes further apart than the clearance can't violate it
+                if (bx0 - ax1 > min_dist or ax0 - bx1 > min_dist or
+                        by0 - ay1 > min_dist or ay0 - by1 > min_dist):
+                    continue
                 
                 # Calculate minimum distance between segments
                 dist = self._segment_to_segment_distance(p1, p2, p3, p4)
@@ -1522,44 +1569,18 @@ class ProceduralGenerators:
         Returns:
             Minimum distance in pixels
         """
-        # Point to segment distance helper
-        def point_to_segment_distance(px, py, x1, y1, x2, y2):
-            # Vector from segment start to point
-            dx = px - x1
-            dy = py - y1
-            
-            # Vector along segment
-            sx = x2 - x1
-            sy = y2 - y1
-            
-            # Segment length squared
-            seg_len_sq = sx * sx + sy * sy
-            
-            if seg_len_sq == 0:
-                # Degenerate segment (point)
-                return math.sqrt(dx * dx + dy * dy)
-            
-            # Project point onto line (parameter t)
-            t = max(0, min(1, (dx * sx + dy * sy) / seg_len_sq))
-            
-            # Closest point on segment
-            closest_x = x1 + t * sx
-            closest_y = y1 + t * sy
-            
-            # Distance to closest point
-            dist_x = px - closest_x
-            dist_y = py - closest_y
-            return math.sqrt(dist_x * dist_x + dist_y * dist_y)
+        x1, y1 = p1
+        x2, y2 = p2
+        x3, y3 = p3
+        x4, y4 = p4
         
         # Check all point-to-segment combinations
-        distances = [
-            point_to_segment_distance(p1[0], p1[1], p3[0], p3[1], p4[0], p4[1]),
-            point_to_segment_distance(p2[0], p2[1], p3[0], p3[1], p4[0], p4[1]),
-            point_to_segment_distance(p3[0], p3[1], p1[0], p1[1], p2[0], p2[1]),
-            point_to_segment_distance(p4[0], p4[1], p1[0], p1[1], p2[0], p2[1]),
-        ]
-        
-        return min(distances)
+        return min(
+            _point_to_segment_distance(x1, y1, x3, y3, x4, y4),
+            _point_to_segment_distance(x2, y2, x3, y3, x4, y4),
+            _point_to_segment_distance(x3, y3, x1, y1, x2, y2),
+            _point_to_segment_distance(x4, y4, x1, y1, x2, y2),
+        )
 
 
     def _check_angles(self, points, min_angle=None):
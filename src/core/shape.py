@@ -2,15 +2,84 @@
 Shape classes for Shape Studio - Phase 2 with Attributes Dictionary
 Base Shape class and implementations for Line, Polygon, and ShapeGroup
 """
+import copy
 import math
+import time
+from collections import deque
 from datetime import datetime
 
 
+# Most recent history entries kept per shape. INFO shows only the last few;
+# bounding the buffer keeps long sessions from growing every shape's
+# history (and its serialized/copied size) without limit.
+HISTORY_LIMIT = 128
+
+# attrs sections holding only scalars and flat lists; clone() copies
+# these one level deep
+_FLAT_ATTRS = ('style', 'relationships', 'metadata')
+
+
+def format_timestamp(ts):
+    """ISO-format a history/metadata timestamp
+    
+    Timestamps are recorded as time.time() floats (cheap on the command
+    path) and only formatted when written out. Values loaded from files are
+    already ISO strings and pass through unchanged.
+    """
+    if isinstance(ts, float):
+        return datetime.fromtimestamp(ts).isoformat()
+    return ts
+
+
+# Point-list transforms shared by all shape types. The trig (or factors) is
+# worked out once per call and the per-point arithmetic is inlined in a
+# single comprehension, rather than a method call per vertex.
+
+def _mean_point(points):
+    """Average of a list of points"""
+    x_sum = sum(p[0] for p in points)
+    y_sum = sum(p[1] for p in points)
+    n = len(points)
+    return (x_sum / n, y_sum / n)
+
+
+def _rotate_points(points, center, angle):
+    """Rotate points around center by angle degrees"""
+    angle_rad = math.radians(angle)
+    cos_a = math.cos(angle_rad)
+    sin_a = math.sin(angle_rad)
+    cx, cy = center
+    return [((x - cx) * cos_a - (y - cy) * sin_a + cx,
+             (x - cx) * sin_a + (y - cy) * cos_a + cy)
+            for x, y in points]
+
+
+def _scale_points(points, center, factor):
+    """Scale points from center by factor"""
+    cx, cy = center
+    return [(cx + (x - cx) * factor, cy + (y - cy) * factor) for x, y in points]
+
+
+def _resize_points(points, center, x_factor, y_factor):
+    """Resize points from center with separate X and Y factors"""
+    cx, cy = center
+    return [(cx + (x - cx) * x_factor, cy + (y - cy) * y_factor) for x, y in points]
+
+
 class Shape:
     """Base class for all shapes with dictionary-based attributes"""
     
+    # Everything else lives in attrs. canonical_name and derived_from are
+    # optional and set only by collision resolution and DERIVE
+    __slots__ = ('name', 'attrs', 'canonical_name', 'derived_from')
+    
+    # Class-level type tag: "shape.is_group" is a plain attribute read,
+    # cheaper than isinstance() in per-shape loops
+    is_group = False
+    
     def __init__(self, name, shape_type):
         self.name = name  # Direct attribute - core identity
+        now = time.time()
         self.attrs = {
             'type': shape_type,
             'geometry': {},      # Shape-specific: points, start/end, members
@@ -21,7 +90,7 @@ class Shape:
                 'z_coord': 0,
                 'fill': None
             },
-            'history': [],       # List of (action_type, command, timestamp)
+            'history': deque(maxlen=HISTORY_LIMIT),  # see add_history()
             'procedure': None,   # Optional: template info
             'relationships': {
                 'group': None,       # Parent group if any
@@ -29,17 +98,75 @@ class Shape:
                 'tracking': []       # Shapes this one tracks
             },
             'metadata': {
-                'created': datetime.now().isoformat(),
-                'modified': datetime.now().isoformat(),
+                'created': now,
+                'modified': now,
                 'tags': []
             }
         }
         
-    def add_history(self, action_type, command):
-        """Add entry to command history"""
-        entry = (action_type, command, datetime.now().isoformat())
-        self.attrs['history'].append(entry)
-        self.attrs['metadata']['modified'] = datetime.now().isoformat()
+    @property
+    def group(self):
+        """Name of the parent group, or None (stored in attrs['relationships'])"""
+        return self.attrs['relationships']['group']
+
+    @group.setter
+    def group(self, group_name):
+        self.attrs['relationships']['group'] = group_name
+
+    def add_history(self, action_type, command, ts=None):
+        """Add entry to command history
+        
+        Entries are (action_type, command, timestamp) tuples. The timestamp
+        is a time.time() float for entries recorded in this session; entries
+        restored by LOAD/LOAD_PROJECT keep the ISO string they were saved
+        with. metadata['created'/'modified'] follow the same rule. Anything
+        displaying a timestamp should pass it through format_timestamp(),
+        which returns an ISO string for either form.
+        
+        Args:
+            action_type: e.g. 'CREATE', 'TRANSFORM'
+            command: Command text that caused the change
+            ts: time.time() of the change; pass one value to stamp several
+                shapes changed by the same command (default: now)
+        """
+        if ts is None:
+            ts = time.time()
+        self.attrs['history'].append((action_type, command, ts))
+        self.attrs['metadata']['modified'] = ts
+
+    def clone(self):
+        """Return an independent copy of this shape
+
+        Cheaper than copy.deepcopy of the whole shape: geometry and history
+        are copied by type-specific code, and style/relationships/metadata
+        only hold scalars and flat lists, so one level of copying is
+        enough. Everything else (e.g. the procedure record, whose
+        parameters can nest) is deep-copied. The optional
+        canonical_name/derived_from attributes are carried over if set.
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.name = self.name
+        for slot in ('canonical_name', 'derived_from'):
+            if hasattr(self, slot):
+                setattr(new, slot, getattr(self, slot))
+
+        attrs = {}
+        for key, value in self.attrs.items():
+            if key in _FLAT_ATTRS and isinstance(value, dict):
+                attrs[key] = {k: list(v) if isinstance(v, list) else v
+                              for k, v in value.items()}
+            elif key not in ('type', 'geometry', 'history'):
+                attrs[key] = copy.deepcopy(value)
+            else:
+                attrs[key] = value
+        attrs['geometry'] = self._clone_geometry()
+        attrs['history'] = deque(self.attrs['history'], maxlen=HISTORY_LIMIT)
+        new.attrs = attrs
+        return new
+
+    def _clone_geometry(self):
+        """Copy the geometry dict for clone()"""
+        return dict(self.attrs['geometry'])
 
     def _apply_alpha(self, color, alpha):
         """Convert color to RGBA tuple with alpha applied
@@ -91,6 +218,8 @@ class Shape:
 class Line(Shape):
     """A line segment"""
     
+    __slots__ = ()
+    
     def __init__(self, name, start, end):
         super().__init__(name, 'Line')
         self.attrs['geometry'] = {
@@ -127,59 +256,41 @@ class Line(Shape):
         """Rotate the line around its center"""
         center = self.get_centroid()
         geom = self.attrs['geometry']
-        geom['start'] = self._rotate_point(geom['start'], center, angle)
-        geom['end'] = self._rotate_point(geom['end'], center, angle)
+        geom['start'], geom['end'] = _rotate_points(
+            (geom['start'], geom['end']), center, angle)
         
     def scale(self, factor):
         """Scale the line from its center"""
         center = self.get_centroid()
         geom = self.attrs['geometry']
-        geom['start'] = self._scale_point(geom['start'], center, factor)
-        geom['end'] = self._scale_point(geom['end'], center, factor)
+        geom['start'], geom['end'] = _scale_points(
+            (geom['start'], geom['end']), center, factor)
         
     def resize(self, x_factor, y_factor):
         """Resize the line with separate X and Y factors"""
         center = self.get_centroid()
         geom = self.attrs['geometry']
-        geom['start'] = self._resize_point(geom['start'], center, x_factor, y_factor)
-        geom['end'] = self._resize_point(geom['end'], center, x_factor, y_factor)
-        
-    def _rotate_point(self, point, center, angle):
-        """Rotate a point around a center by angle degrees"""
-        angle_rad = math.radians(angle)
-        cos_a = math.cos(angle_rad)
-        sin_a = math.sin(angle_rad)
-        
-        x = point[0] - center[0]
-        y = point[1] - center[1]
-        
-        new_x = x * cos_a - y * sin_a
-        new_y = x * sin_a + y * cos_a
-        
-        return (new_x + center[0], new_y + center[1])
-        
-    def _scale_point(self, point, center, factor):
-        """Scale a point from a center by factor"""
-        x = center[0] + (point[0] - center[0]) * factor
-        y = center[1] + (point[1] - center[1]) * factor
-        return (x, y)
-        
-    def _resize_point(self, point, center, x_factor, y_factor):
-        """Resize a point from a center with separate X and Y factors"""
-        x = center[0] + (point[0] - center[0]) * x_factor
-        y = center[1] + (point[1] - center[1]) * y_factor
-        return (x, y)
+        geom['start'], geom['end'] = _resize_points(
+            (geom['start'], geom['end']), center, x_factor, y_factor)
 
 
 class Polygon(Shape):
     """A polygon (closed shape with multiple vertices)"""
     
+    __slots__ = ()
+    
     def __init__(self, name, points):
         super().__init__(name, 'Polygon')
         self.attrs['geometry'] = {
             'points': points
         }
         
+    def _clone_geometry(self):
+        """Copy the geometry dict, including the point list"""
+        geom = dict(self.attrs['geometry'])
+        geom['points'] = list(geom['points'])
+        return geom
+
     def draw(self, draw_context):
         """Draw the polygon using style attributes"""
         geom = self.attrs['geometry']
@@ -207,61 +318,33 @@ class Polygon(Shape):
         
     def get_centroid(self):
         """Get the center point of the polygon"""
-        geom = self.attrs['geometry']
-        points = geom['points']
-        x_sum = sum(p[0] for p in points)
-        y_sum = sum(p[1] for p in points)
-        n = len(points)
-        return (x_sum / n, y_sum / n)
+        return _mean_point(self.attrs['geometry']['points'])
         
     def rotate(self, angle):
         """Rotate the polygon around its center"""
         center = self.get_centroid()
         geom = self.attrs['geometry']
-        geom['points'] = [self._rotate_point(p, center, angle) for p in geom['points']]
+        geom['points'] = _rotate_points(geom['points'], center, angle)
         
     def scale(self, factor):
         """Scale the polygon from its center"""
         center = self.get_centroid()
         geom = self.attrs['geometry']
-        geom['points'] = [self._scale_point(p, center, factor) for p in geom['points']]
+        geom['points'] = _scale_points(geom['points'], center, factor)
         
     def resize(self, x_factor, y_factor):
         """Resize the polygon with separate X and Y factors"""
         center = self.get_centroid()
         geom = self.attrs['geometry']
-        geom['points'] = [self._resize_point(p, center, x_factor, y_factor) for p in geom['points']]
-        
-    def _rotate_point(self, point, center, angle):
-        """Rotate a point around a center by angle degrees"""
-        angle_rad = math.radians(angle)
-        cos_a = math.cos(angle_rad)
-        sin_a = math.sin(angle_rad)
-        
-        x = point[0] - center[0]
-        y = point[1] - center[1]
-        
-        new_x = x * cos_a - y * sin_a
-        new_y = x * sin_a + y * cos_a
-        
-        return (new_x + center[0], new_y + center[1])
-        
-    def _scale_point(self, point, center, factor):
-        """Scale a point from a center by factor"""
-        x = center[0] + (point[0] - center[0]) * factor
-        y = center[1] + (point[1] - center[1]) * factor
-        return (x, y)
-        
-    def _resize_point(self, point, center, x_factor, y_factor):
-        """Resize a point from a center with separate X and Y factors"""
-        x = center[0] + (point[0] - center[0]) * x_factor
-        y = center[1] + (point[1] - center[1]) * y_factor
-        return (x, y)
+        geom['points'] = _resize_points(geom['points'], center, x_factor, y_factor)
 
 
 class ShapeGroup(Shape):
     """A group of shapes that can be manipulated as a unit"""
     
+    __slots__ = ()
+    is_group = True
+    
     def __init__(self, name, members):
         super().__init__(name, 'ShapeGroup')
         self.attrs['geometry'] = {
@@ -270,8 +353,14 @@ class ShapeGroup(Shape):
         
         # Mark all members as belonging to this group
         for member in members:
-            member.attrs['relationships']['group'] = name
+            member.group = name
             
+    def _clone_geometry(self):
+        """Copy the geometry dict, cloning each member"""
+        geom = dict(self.attrs['geometry'])
+        geom['members'] = [member.clone() for member in geom['members']]
+        return geom
+
     def draw(self, draw_context):
         """Draw all member shapes, respecting their z-order within the group"""
         members = self.attrs['geometry']['members']
@@ -291,64 +380,57 @@ class ShapeGroup(Shape):
     def get_centroid(self):
         """Get the collective centroid of all members"""
         members = self.attrs['geometry']['members']
-        centroids = [member.get_centroid() for member in members]
-        x_sum = sum(c[0] for c in centroids)
-        y_sum = sum(c[1] for c in centroids)
-        n = len(centroids)
-        return (x_sum / n, y_sum / n)
+        return _mean_point([member.get_centroid() for member in members])
         
     def rotate(self, angle):
         """Rotate all members around the group's collective centroid"""
-        group_center = self.get_centroid()
         members = self.attrs['geometry']['members']
+        centers = [member.get_centroid() for member in members]
+        new_centers = _rotate_points(centers, _mean_point(centers), angle)
         
-        for member in members:
-            # First, rotate the member's own center around the group center
-            member_center = member.get_centroid()
-            new_center = self._rotate_point(member_center, group_center, angle)
-            
-            # Move member so its center is at the new position
-            dx = new_center[0] - member_center[0]
-            dy = new_center[1] - member_center[1]
-            member.move(dx, dy)
-            
-            # Then rotate the member around its own center
+        for member, center, new_center in zip(members, centers, new_centers):
+            # Move member so its center is at the new position, then
+            # rotate the member around its own center
+            member.move(new_center[0] - center[0], new_center[1] - center[1])
             member.rotate(angle)
             
     def scale(self, factor):
         """Scale all members from the group's collective centroid"""
-        group_center = self.get_centroid()
         members = self.attrs['geometry']['members']
+        centers = [member.get_centroid() for member in members]
+        new_centers = _scale_points(centers, _mean_point(centers), factor)
         
-        for member in members:
-            # Scale member's position relative to group center
-            member_center = member.get_centroid()
-            new_center = self._scale_point(member_center, group_center, factor)
-            
-            dx = new_center[0] - member_center[0]
-            dy = new_center[1] - member_center[1]
-            member.move(dx, dy)
-            
-            # Scale the member itself
+        for member, center, new_center in zip(members, centers, new_centers):
+            # Move member so its center is at the new position, then
+            # scale the member around its own center
+            member.move(new_center[0] - center[0], new_center[1] - center[1])
             member.scale(factor)
             
     def resize(self, x_factor, y_factor):
         """Resize all members with separate X and Y factors"""
-        group_center = self.get_centroid()
         members = self.attrs['geometry']['members']
+        centers = [member.get_centroid() for member in members]
+        new_centers = _resize_points(centers, _mean_point(centers), x_factor, y_factor)
         
-        for member in members:
-            # Resize member's position relative to group center
-            member_center = member.get_centroid()
-            new_center = self._resize_point(member_center, group_center, x_factor, y_factor)
-            
-            dx = new_center[0] - member_center[0]
-            dy = new_center[1] - member_center[1]
-            member.move(dx, dy)
-            
-            # Resize the member itself
+        for member, center, new_center in zip(members, centers, new_centers):
+            # Move member so its center is at the new position, then
+            # resize the member around its own center
+            member.move(new_center[0] - center[0], new_center[1] - center[1])
             member.resize(x_factor, y_factor)
             
+    def remove_member(self, member):
+        """Remove a member shape from the group
+        
+        Matches by identity, so no __eq__ calls are made; member order is
+        kept because it breaks z-order ties when drawing.
+        """
+        members = self.attrs['geometry']['members']
+        for i, candidate in enumerate(members):
+            if candidate is member:
+                del members[i]
+                return
+        raise ValueError(f"Shape '{member.name}' is not a member of '{self.name}'")
+            
     def get_members(self, recursive=False):
         """Get list of member shapes
         
@@ -363,34 +445,8 @@ class ShapeGroup(Shape):
         # Recursively collect all members
         all_members = []
         for member in members:
-            if isinstance(member, ShapeGroup):
+            if member.is_group:
                 all_members.extend(member.get_members(recursive=True))
             else:
                 all_members.append(member)
         return all_members
-        
-    def _rotate_point(self, point, center, angle):
-        """Rotate a point around a center by angle degrees"""
-        angle_rad = math.radians(angle)
-        cos_a = math.cos(angle_rad)
-        sin_a = math.sin(angle_rad)
-        
-        x = point[0] - center[0]
-        y = point[1] - center[1]
-        
-        new_x = x * cos_a - y * sin_a
-        new_y = x * sin_a + y * cos_a
-        
-        return (new_x + center[0], new_y + center[1])
-        
-    def _scale_point(self, point, center, factor):
-        """Scale a point from a center by factor"""
-        x = center[0] + (point[0] - center[0]) * factor
-        y = center[1] + (point[1] - center[1]) * factor
-        return (x, y)
-        
-    def _resize_point(self, point, center, x_factor, y_factor):
-        """Resize a point from a center with separate X and Y factors"""
-        x = center[0] + (point[0] - center[0]) * x_factor
-        y = center[1] + (point[1] - center[1]) * y_factor
-        return (x, y)
\ No newline at end of file
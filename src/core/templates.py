@@ -209,8 +209,9 @@ class TemplateExecutor:
         if not filepath.exists():
             raise FileNotFoundError(f"Script file not found: {filepath}")
         
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        # Shared with the executor's RUN/BATCH loading, so BATCH iterations
+        # reuse one parse of the script
+        data = self.executor._read_script_json(filepath)
         
         # Check if it's new format (with executables) or old format (array)
         if isinstance(data, list):
@@ -761,7 +762,7 @@ class TemplateExecutor:
     def _load_source_shape(self, shape_name):
         """Load a stored shape onto the active canvas for DERIVE."""
         self.executor.execute(f"LOAD {shape_name}")
-        shapes = self.executor.get_active_shapes()
+        shapes = self.executor.active_shapes
         for shape in shapes.values():
             if not hasattr(shape, 'derived_from'):
                 shape.derived_from = shape_name
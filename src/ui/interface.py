@@ -14,6 +14,19 @@ class ShapeStudioUI:
     
     def __init__(self, executor):
         self.executor = executor
+        # The Tk root (and with it the Tcl interpreter) is created lazily in
+        # run(), so constructing the UI object stays cheap and headless
+        self.root = None
+
+        self.command_counter = 0
+        self.command_history = []
+        self.history_index = -1
+        self.zoom_level = 1.0  # Default zoom level (100%)
+        self.replay_dialog = None
+        self._load_command_history()
+
+    def _build_window(self):
+        """Create the Tk root window and all widgets"""
         self.root = tk.Tk()
         self.root.title(config.ui.window_title)
         
@@ -24,13 +37,6 @@ class ShapeStudioUI:
         self.root.bind('<Escape>', self.toggle_fullscreen)
         self.root.bind('<F11>', self.toggle_fullscreen)
         
-        self.command_counter = 0
-        self.command_history = []
-        self.history_index = -1
-        self.zoom_level = 1.0  # Default zoom level (100%)
-        self.replay_dialog = None
-        self._load_command_history()
-        
         self._setup_ui()
         self._update_canvas_display()
 
@@ -437,6 +443,8 @@ class ShapeStudioUI:
 
     def run(self):
         """Start the UI main loop"""
+        if self.root is None:
+            self._build_window()
         self.root.mainloop()
 
 # ---------------------------------------------------------------------------
@@ -195,6 +195,51 @@ def test_usage_patterns():
     print()
 
 
+def test_load_cache():
+    """Test that unchanged config files are parsed only once"""
+    import json
+    import tempfile
+    from src import config as config_module
+    
+    print("=" * 60)
+    print("TEST 8: Config File Cache")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'config.json')
+        with open(path, 'w') as f:
+            json.dump({'canvas': {'width': 512}, 'animation': {'fps_range': [1, 5]}}, f)
+        
+        first = Config()
+        first.load(path)
+        parsed = config_module._file_cache[os.path.abspath(path)][1]
+        
+        second = Config()
+        second.load(path)
+        assert config_module._file_cache[os.path.abspath(path)][1] is parsed
+        assert second.canvas.width == 512
+        print("OK Unchanged file reused without re-parsing")
+        
+        # Each Config gets its own copy of list values from the shared parse
+        first.animation.fps_range.append(99)
+        assert second.animation.fps_range == [1, 5]
+        assert parsed['animation']['fps_range'] == [1, 5]
+        print("OK List values not shared between configs")
+        
+        # Rewrite with a newer mtime - must be picked up
+        with open(path, 'w') as f:
+            json.dump({'canvas': {'width': 640}}, f)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        third = Config()
+        third.load(path)
+        assert third.canvas.width == 640
+        print("OK Modified file re-parsed")
+    
+    print()
+
+
 def main():
     """Run all tests"""
     print("\n")
@@ -211,6 +256,7 @@ def main():
         test_validation_config()
         test_all_defaults()
         test_usage_patterns()
+        test_load_cache()
         
         print("=" * 60)
         print("ALL TESTS PASSED OK")
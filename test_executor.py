@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Command Executor Test
+Validates script section parsing, RUN label selection and shape
+history round trips through STORE/LOAD and SAVE_PROJECT/LOAD_PROJECT
+"""
+import sys
+import os
+import json
+import math
+import tempfile
+from collections import deque
+from datetime import datetime
+from contextlib import contextmanager
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.config import config
+from src.core.canvas import Canvas
+from src.core.shape import HISTORY_LIMIT, format_timestamp
+from src.commands.executor import CommandExecutor
+
+# Commands read keys that only the project config.json defines
+try:
+    config.load()
+except RuntimeError:
+    pass  # already loaded in this process
+
+
+@contextmanager
+def _executor_in_tempdir():
+    """CommandExecutor whose output/store/script directories live in a temp dir"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            os.makedirs('scripts')
+            yield CommandExecutor(Canvas(), Canvas())
+        finally:
+            os.chdir(cwd)
+
+
+SECTIONED_SCRIPT = """# header comment
+POLY a 0,0 10,0 10,10
+
+@first
+  POLY b 0,0 20,0 20,20
+# comment inside a section
+
+MOVE b 1,1
+eof
+@  second
+LINE c 0,0 5,5
+   EoF
+  # indented comment
+LINE d 1,1 6,6
+@first
+ROTATE b 10
+@empty
+EOF
+@EOF
+SCALE b 2
+"""
+
+
+def test_text_sections():
+    """Test @label / EOF section parsing of plain-text scripts"""
+    print("=" * 60)
+    print("TEST 1: Text Script Sections")
+    print("=" * 60)
+
+    with _executor_in_tempdir() as ex:
+        sections = ex._parse_text_sections(SECTIONED_SCRIPT)
+
+    # Commands after an EOF form a new unlabeled section, replacing the
+    # earlier one; a repeated label likewise replaces its first section
+    # but keeps its original position. Sections without commands are dropped.
+    assert sections == {
+        '': ['LINE d 1,1 6,6'],
+        'first': ['ROTATE b 10'],
+        'second': ['LINE c 0,0 5,5'],
+        'EOF': ['SCALE b 2'],
+    }, sections
+    assert list(sections) == ['', 'first', 'second', 'EOF']
+    print("OK Labels, mixed-case EOF, comments and blank lines handled")
+
+    with _executor_in_tempdir() as ex:
+        assert ex._parse_text_sections("") == {}
+        assert ex._parse_text_sections("# only\n\n  \nEOF\n") == {}
+        assert ex._parse_text_sections("POLY a 0,0 1,0 1,1") == {'': ['POLY a 0,0 1,0 1,1']}
+    print("OK Empty and comment-only scripts yield no sections")
+    print()
+
+
+def test_run_labels():
+    """Test RUN label selection, including a missing label"""
+    print("=" * 60)
+    print("TEST 2: RUN Labels")
+    print("=" * 60)
+
+    with _executor_in_tempdir() as ex:
+        with open(os.path.join('scripts', 'labels.txt'), 'w') as f:
+            f.write("@one\nPOLY p1 0,0 10,0 10,10\nEOF\n"
+                    "@two\nLINE l1 0,0 5,5\nEOF\n")
+
+        result = ex.execute("RUN labels.txt two")
+        assert "section 'two'" in result, result
+        assert set(ex.wip_shapes) == {'l1'}
+        print("OK Labeled section executed")
+
+        result = ex.execute("RUN labels.txt")
+        assert "section 'one' (first section)" in result, result
+        assert set(ex.wip_shapes) == {'l1', 'p1'}
+        print("OK First section used when no label given")
+
+        try:
+            ex.execute("RUN labels.txt three")
+        except ValueError as e:
+            assert "Label 'three' not found" in str(e)
+            assert "Available labels: one, two" in str(e)
+            print(f"OK Missing label rejected: {str(e).splitlines()[0]}")
+        else:
+            raise AssertionError("RUN with a missing label should fail")
+
+    print()
+
+
+# Shape and project JSON as written before history became a bounded deque
+# of time.time() floats: history entries and metadata times are ISO strings
+LEGACY_SHAPE = {
+    "name": "old", "type": "Polygon",
+    "attrs": {
+        "type": "Polygon",
+        "geometry": {"points": [[5.0, 5.0], [45.0, 5.0], [45.0, 45.0]]},
+        "style": {"color": "black", "width": 2, "transparency": 1.0, "z_coord": 0, "fill": None},
+        "history": [["CREATE", "POLY old 0,0 40,0 40,40", "2026-10-16T09:42:52.747614"],
+                    ["TRANSFORM", "MOVE old 5,5", "2026-10-16T09:42:52.749262"]],
+        "procedure": None,
+        "relationships": {"group": None, "attached_to": [], "tracking": []},
+        "metadata": {"created": "2026-10-16T09:42:52.747600",
+                     "modified": "2026-10-16T09:42:52.749268", "tags": []},
+    },
+}
+
+LEGACY_PROJECT = {
+    "version": "1.0", "created": "2026-10-16T09:42:52.751942",
+    "wip_shapes": {
+        "old": LEGACY_SHAPE,
+        "l1": {"name": "l1", "type": "Line", "attrs": {
+            "type": "Line", "geometry": {"start": [0.0, 0.0], "end": [10.0, 10.0]},
+            "style": {"color": "black", "width": 2, "transparency": 1.0, "z_coord": 1, "fill": None},
+            "history": [["CREATE", "LINE l1 0,0 10,10", "2026-10-16T09:42:52.750407"]],
+            "procedure": None,
+            "relationships": {"group": "g1", "attached_to": [], "tracking": []},
+            "metadata": {"created": "2026-10-16T09:42:52.750399",
+                         "modified": "2026-10-16T09:42:52.750408", "tags": []}}},
+        "g1": {"name": "g1", "type": "ShapeGroup", "attrs": {
+            "type": "ShapeGroup", "geometry": {"members": ["l1"]},
+            "style": {"color": "black", "width": 2, "transparency": 1.0, "z_coord": 0, "fill": None},
+            "history": [["CREATE", "GROUP g1 l1", "2026-10-16T09:42:52.751356"]],
+            "procedure": None,
+            "relationships": {"group": None, "attached_to": [], "tracking": []},
+            "metadata": {"created": "2026-10-16T09:42:52.751347",
+                         "modified": "2026-10-16T09:42:52.751356", "tags": []}}},
+    },
+    "main_shapes": {}, "stash": {},
+    "canvas_settings": {"show_grid": True, "show_rulers": True},
+    "active_canvas": "WIP",
+}
+
+
+def _as_written(history):
+    """History entries as they should appear once serialized"""
+    return [(action, command, format_timestamp(ts)) for action, command, ts in history]
+
+
+def _assert_history_restored(shape, expected):
+    """Check a loaded shape's history buffer against expected entries"""
+    history = shape.attrs['history']
+    assert isinstance(history, deque) and history.maxlen == HISTORY_LIMIT
+    assert all(isinstance(entry, tuple) for entry in history)
+    assert list(history) == expected
+
+
+def test_store_round_trip():
+    """Test that STORE/LOAD keeps history entries, timestamps and the cap"""
+    print("=" * 60)
+    print("TEST 3: STORE/LOAD History Round Trip")
+    print("=" * 60)
+
+    with _executor_in_tempdir() as ex:
+        ex.execute("POLY p1 0,0 40,0 40,40")
+        for i in range(HISTORY_LIMIT + 5):
+            ex.execute(f"MOVE p1 {i},1")
+        shape = ex.wip_shapes['p1']
+        history = list(shape.attrs['history'])
+        assert len(history) == HISTORY_LIMIT
+        assert history[-1][1] == f"MOVE p1 {HISTORY_LIMIT + 4},1"
+        # In memory, entries recorded this session carry time.time() floats
+        assert all(isinstance(ts, float) for _, _, ts in history)
+        assert isinstance(shape.attrs['metadata']['created'], float)
+        metadata = dict(shape.attrs['metadata'])
+
+        ex.execute("STORE p1")
+        with open(os.path.join('shapes', 'p1.json')) as f:
+            stored = json.load(f)['attrs']
+        assert [tuple(entry) for entry in stored['history']] == _as_written(history)
+        assert stored['metadata']['created'] == format_timestamp(metadata['created'])
+        assert stored['metadata']['modified'] == format_timestamp(metadata['modified'])
+        print(f"OK Stored {len(history)} history entries with ISO timestamps")
+
+        ex.execute("CLEAR WIP ALL")
+        ex.execute("LOAD p1")
+        loaded = ex.wip_shapes['p1']
+        # LOAD appends its own entry, pushing the oldest out of the buffer
+        expected = _as_written(history)[1:]
+        last = loaded.attrs['history'][-1]
+        assert last[0] == 'LOAD' and isinstance(last[2], float)
+        _assert_history_restored(loaded, expected + [last])
+        assert loaded.attrs['metadata']['created'] == format_timestamp(metadata['created'])
+        print("OK Loaded history matches, capped at HISTORY_LIMIT")
+
+        # Restored entries keep ISO strings, new ones are floats; both
+        # display the same way through format_timestamp
+        restored_ts = loaded.attrs['history'][-2][2]
+        assert isinstance(restored_ts, str)
+        assert format_timestamp(restored_ts) == restored_ts
+        assert format_timestamp(last[2]) == datetime.fromtimestamp(last[2]).isoformat()
+
+        # Storing the mixed buffer again writes ISO strings throughout
+        ex.execute("STORE p1")
+        with open(os.path.join('shapes', 'p1.json')) as f:
+            restored = json.load(f)['attrs']['history']
+        assert [tuple(entry) for entry in restored] == _as_written(loaded.attrs['history'])
+        assert all(isinstance(entry[2], str) for entry in restored)
+        print("OK Mixed float/ISO history re-stored as ISO strings")
+
+    print()
+
+
+def test_project_round_trip():
+    """Test that SAVE_PROJECT/LOAD_PROJECT keeps every shape's history"""
+    print("=" * 60)
+    print("TEST 4: SAVE_PROJECT/LOAD_PROJECT History Round Trip")
+    print("=" * 60)
+
+    with _executor_in_tempdir() as ex:
+        for command in ["POLY p1 0,0 40,0 40,40", "ROTATE p1 15",
+                        "LINE l1 0,0 10,10", "LINE l2 5,5 20,20",
+                        "GROUP g1 l1", "STASH l2"]:
+            ex.execute(command)
+        saved = {name: _as_written(shape.attrs['history'])
+                 for name, shape in list(ex.wip_shapes.items()) + list(ex.stash.items())}
+
+        ex.execute("SAVE_PROJECT rt")
+        restored = CommandExecutor(Canvas(), Canvas())
+        restored.execute("LOAD_PROJECT rt")
+
+        assert set(restored.wip_shapes) == {'p1', 'l1', 'g1'}
+        assert set(restored.stash) == {'l2'}
+        for name, expected in saved.items():
+            shape = restored.wip_shapes.get(name) or restored.stash[name]
+            _assert_history_restored(shape, expected)
+        group = restored.wip_shapes['g1']
+        assert group.attrs['geometry']['members'] == [restored.wip_shapes['l1']]
+        print(f"OK History restored for {len(saved)} shapes including group and stash")
+
+    print()
+
+
+def test_legacy_json_loads():
+    """Test that shape/project JSON written before the deque change still loads"""
+    print("=" * 60)
+    print("TEST 5: Legacy JSON Compatibility")
+    print("=" * 60)
+
+    with _executor_in_tempdir() as ex:
+        os.makedirs('shapes')
+        os.makedirs('projects')
+        with open(os.path.join('shapes', 'old.json'), 'w') as f:
+            json.dump(LEGACY_SHAPE, f, indent=2)
+        with open(os.path.join('projects', 'legacy.shapestudio'), 'w') as f:
+            json.dump(LEGACY_PROJECT, f, indent=2)
+
+        legacy_history = [tuple(entry) for entry in LEGACY_SHAPE['attrs']['history']]
+
+        ex.execute("LOAD old")
+        shape = ex.wip_shapes['old']
+        assert shape.attrs['geometry']['points'] == [(5.0, 5.0), (45.0, 5.0), (45.0, 45.0)]
+        assert list(shape.attrs['history'])[:2] == legacy_history
+        print("OK Legacy shape loaded with ISO-string history")
+
+        # Re-storing keeps the legacy strings as they were
+        ex.execute("STORE old")
+        with open(os.path.join('shapes', 'old.json')) as f:
+            stored = json.load(f)['attrs']
+        assert [tuple(entry) for entry in stored['history']][:2] == legacy_history
+        assert stored['metadata']['created'] == LEGACY_SHAPE['attrs']['metadata']['created']
+        print("OK Legacy timestamps written back unchanged")
+
+        ex.execute("LOAD_PROJECT legacy")
+        assert set(ex.wip_shapes) == {'old', 'l1', 'g1'}
+        for name, data in LEGACY_PROJECT['wip_shapes'].items():
+            _assert_history_restored(ex.wip_shapes[name],
+                                     [tuple(entry) for entry in data['attrs']['history']])
+        assert ex.wip_shapes['g1'].attrs['geometry']['members'] == [ex.wip_shapes['l1']]
+        print("OK Legacy project loaded with group members relinked")
+
+    print()
+
+
+def test_store_encoder_edge_cases():
+    """Test that non-string keys and non-finite floats survive STORE/LOAD"""
+    print("=" * 60)
+    print("TEST 6: STORE/LOAD Encoder Edge Cases")
+    print("=" * 60)
+
+    with _executor_in_tempdir() as ex:
+        ex.execute("POLY p1 0,0 40,0 40,40")
+        ex.wip_shapes['p1'].attrs['procedure'] = {
+            'method': 'dynamic_polygon',
+            'parameters': {5: 'five', 'limits': [float('nan'), float('inf')]},
+        }
+
+        ex.execute("STORE p1")
+        ex.execute("CLEAR WIP ALL")
+        ex.execute("LOAD p1")
+
+        params = ex.wip_shapes['p1'].attrs['procedure']['parameters']
+        # Same result with or without orjson: keys become strings, as with json
+        assert params['5'] == 'five'
+        nan, inf = params['limits']
+        assert math.isnan(nan) and inf == float('inf')
+        print("OK Integer key and NaN/inf round-tripped")
+
+    print()
+
+
+def main():
+    """Run all tests"""
+    try:
+        test_text_sections()
+        test_run_labels()
+        test_store_round_trip()
+        test_project_round_trip()
+        test_legacy_json_loads()
+        test_store_encoder_edge_cases()
+
+        print("=" * 60)
+        print("ALL TESTS PASSED OK")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\nFAIL TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
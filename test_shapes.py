@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Shape Cloning Test
+Validates that Shape.clone() yields copies independent of the original
+"""
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.shape import Line, Polygon, ShapeGroup
+
+
+def _decorate(shape):
+    """Give a shape history, tags, links and a nested procedure record"""
+    shape.add_history('CREATE', f'create {shape.name}')
+    shape.attrs['metadata']['tags'].append('orig')
+    shape.attrs['relationships']['attached_to'].append('anchor')
+    shape.attrs['procedure'] = {
+        'method': 'dynamic_polygon',
+        'parameters': {'vertices': [5, 8], 'operations': [['sawtooth', 1]]},
+    }
+
+
+def _mutate(shape):
+    """Change every mutable part of a (cloned) shape in place"""
+    shape.attrs['style']['color'] = 'red'
+    shape.add_history('MOVE', 'moved clone')
+    shape.attrs['metadata']['tags'].append('clone')
+    shape.attrs['relationships']['attached_to'].append('other')
+    shape.attrs['relationships']['group'] = 'elsewhere'
+    shape.attrs['procedure']['parameters']['vertices'][0] = 99
+    shape.attrs['procedure']['parameters']['operations'].append(['squarewave', 1])
+
+
+def _assert_untouched(shape):
+    """Check that _mutate() on a clone left the original as decorated"""
+    assert shape.attrs['style']['color'] == 'black'
+    assert [entry[0] for entry in shape.attrs['history']] == ['CREATE']
+    assert shape.attrs['metadata']['tags'] == ['orig']
+    assert shape.attrs['relationships']['attached_to'] == ['anchor']
+    params = shape.attrs['procedure']['parameters']
+    assert params['vertices'] == [5, 8]
+    assert params['operations'] == [['sawtooth', 1]]
+
+
+def test_clone_line():
+    """Test that a cloned Line is independent of the original"""
+    print("=" * 60)
+    print("TEST 1: Clone Line")
+    print("=" * 60)
+
+    line = Line('l1', (10, 10), (100, 100))
+    _decorate(line)
+
+    copy = line.clone()
+    copy.move(5, 5)
+    _mutate(copy)
+
+    assert line.attrs['geometry'] == {'start': (10, 10), 'end': (100, 100)}
+    assert line.group is None
+    _assert_untouched(line)
+    print("OK Original line unchanged after mutating clone")
+    print()
+
+
+def test_clone_polygon():
+    """Test that a cloned Polygon is independent of the original"""
+    print("=" * 60)
+    print("TEST 2: Clone Polygon")
+    print("=" * 60)
+
+    points = [(0, 0), (50, 0), (50, 50)]
+    poly = Polygon('p1', list(points))
+    _decorate(poly)
+
+    copy = poly.clone()
+    copy.attrs['geometry']['points'].append((0, 50))
+    copy.attrs['geometry']['points'][0] = (-1, -1)
+    _mutate(copy)
+
+    assert poly.attrs['geometry']['points'] == points
+    assert poly.group is None
+    _assert_untouched(poly)
+    print("OK Original polygon unchanged after mutating clone")
+    print()
+
+
+def test_clone_group():
+    """Test that a cloned ShapeGroup copies its members too"""
+    print("=" * 60)
+    print("TEST 3: Clone ShapeGroup")
+    print("=" * 60)
+
+    poly = Polygon('p1', [(0, 0), (50, 0), (50, 50)])
+    line = Line('l1', (10, 10), (100, 100))
+    group = ShapeGroup('g1', [poly, line])
+    _decorate(group)
+
+    copy = group.clone()
+    copy_poly, copy_line = copy.attrs['geometry']['members']
+    assert copy_poly is not poly and copy_line is not line
+
+    copy.move(10, 0)
+    copy_poly.attrs['geometry']['points'].append((0, 50))
+    copy_line.group = None
+    copy.attrs['geometry']['members'].pop()
+    _mutate(copy)
+
+    assert group.attrs['geometry']['members'] == [poly, line]
+    assert poly.attrs['geometry']['points'] == [(0, 0), (50, 0), (50, 50)]
+    assert line.attrs['geometry']['start'] == (10, 10)
+    assert poly.group == 'g1' and line.group == 'g1'
+    _assert_untouched(group)
+    print("OK Original group and members unchanged after mutating clone")
+    print()
+
+
+def main():
+    """Run all tests"""
+    try:
+        test_clone_line()
+        test_clone_polygon()
+        test_clone_group()
+
+        print("=" * 60)
+        print("ALL TESTS PASSED OK")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\nFAIL TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())